@@ -5,6 +5,7 @@ from test_alconna.core_test import *
 from test_alconna.components_test import *
 from test_alconna.config_test import *
 from test_alconna.analyser_test import *
+from test_alconna.manager_test import *
 
 if __name__ == '__main__':
     import pytest
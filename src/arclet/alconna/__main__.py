@@ -0,0 +1,135 @@
+"""
+离线解析消息日志
+
+Examples:
+    $ python -m arclet.alconna my_bot.commands chat.log -o result.jsonl
+    $ python -m arclet.alconna ./commands.py chat.ndjson --ndjson --command "bot::ban" --workers 4
+"""
+import argparse
+import importlib
+import json
+import mmap
+import os
+import sys
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence, IO
+
+from .arpamar import ArpamarRecord
+from .config import config
+from .manager import command_manager, _pool_stream, _worker_broadcast, _worker_parse
+
+
+def load_module(target: str) -> str:
+    """导入定义命令的模块, 可以是模块名或 .py 文件的路径; 返回可供工作进程导入的模块名"""
+    if target.endswith(".py") or os.sep in target:
+        path = os.path.abspath(target)
+        sys.path.insert(0, os.path.dirname(path))
+        target = os.path.splitext(os.path.basename(path))[0]
+    importlib.import_module(target)
+    return target
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """
+    逐行读取输入, 文件以 mmap 映射, 不会被一次性读入内存; path 为 '-' 时读取标准输入
+
+    输入以 UTF-8 解码, 无法解码的字节替换为 U+FFFD, 不会中止整个批次
+    """
+    if path == "-":
+        for line in sys.stdin.buffer:
+            yield line.decode("utf-8", "replace").rstrip("\r\n")
+        return
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                yield line.decode("utf-8", "replace").rstrip("\r\n")
+
+
+def read_messages(lines: Iterator[str], ndjson: bool = False, field: str = "message") -> Iterator[Any]:
+    """将输入的行转换为消息; ndjson 模式下每行为一个 JSON 值, 对象取其 field 字段, 数组视为消息链"""
+    for line in lines:
+        if not ndjson:
+            yield line
+        elif not line.strip():
+            yield ""
+        elif isinstance(data := json.loads(line), dict):
+            yield data.get(field, "")
+        else:
+            yield data
+
+
+def _encode(obj: Any) -> Any:
+    if obj is Ellipsis:
+        return None
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def dump_record(record: Optional[ArpamarRecord]) -> str:
+    """将一条解析结果转换为 JSON 文本"""
+    result: Dict[str, Any] = {
+        "command": None, "matched": False, "main_args": {}, "options": {}, "subcommands": {}, "error": None
+    }
+    if record is not None:
+        result.update(
+            command=record.source, matched=record.matched, main_args=record.main_args, options=record.options,
+            subcommands=record.subcommands, error=record.error_info
+        )
+    return json.dumps(result, ensure_ascii=False, default=_encode)
+
+
+def parse_stream(
+    messages: Iterator[Any],
+    namespace: str = '',
+    command: Optional[str] = None,
+    workers: int = 0,
+    modules: Sequence[str] = (),
+    chunksize: int = 256,
+) -> Iterator[Optional[ArpamarRecord]]:
+    """
+    按输入顺序产出每条消息的解析结果
+
+    指定 command 时以该命令解析, 否则广播给命名空间内的命令; workers 大于 0 时在进程池中解析,
+    否则在当前进程内按 chunksize 分批解析
+    """
+    worker, target = (_worker_parse, command) if command else (_worker_broadcast, namespace)
+    if workers > 0:
+        yield from _pool_stream(worker, target, messages, workers, modules, chunksize)
+        return
+    while chunk := list(islice(messages, chunksize)):
+        yield from worker(target, chunk)  # type: ignore
+
+
+def main(argv: Optional[List[str]] = None, output: Optional[IO[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m arclet.alconna", description="以 Alconna 命令离线解析消息日志")
+    parser.add_argument("module", help="定义命令的模块名或 .py 文件路径")
+    parser.add_argument("input", help="按行分隔的输入文件, '-' 表示标准输入")
+    parser.add_argument("-o", "--output", default="-", help="JSONL 输出文件, 默认为标准输出")
+    parser.add_argument("-n", "--namespace", default="", help="广播的命名空间, 默认为所有命名空间")
+    parser.add_argument("-c", "--command", help="只以该命令解析, 如 'namespace::name'")
+    parser.add_argument("--ndjson", action="store_true", help="输入的每行为一个 JSON 值")
+    parser.add_argument("--field", default="message", help="ndjson 模式下消息所在的字段")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="工作进程数, 为 0 时在当前进程内解析")
+    parser.add_argument("--chunksize", type=int, default=256, help="每批消息的数量")
+    args = parser.parse_args(argv)
+
+    module = load_module(args.module)
+    if args.command and command_manager.get_command(args.command) is None:
+        parser.error(config.lang.manager_undefined_command.format(target=args.command))
+    messages = read_messages(read_lines(args.input), args.ndjson, args.field)
+    records = parse_stream(messages, args.namespace, args.command, args.workers, [module], args.chunksize)
+    out = output or (sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8"))
+    try:
+        for record in records:
+            out.write(dump_record(record) + "\n")
+    finally:
+        if out is not sys.stdout and output is None:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,10 @@
 import re
-import traceback
+from contextlib import suppress
 from weakref import finalize
 from copy import copy
+from types import MethodType
 from typing import (
-    Dict, Union, List, Optional, TYPE_CHECKING, Tuple, Any, Generic, TypeVar, Set, Callable, ClassVar
+    Dict, Union, List, Optional, TYPE_CHECKING, Tuple, Any, Generic, TypeVar, Set, Callable, ClassVar, FrozenSet
 )
 from nepattern import pattern_map, type_parser, BasePattern
 from nepattern.util import TPattern
@@ -13,13 +14,15 @@ from ..exceptions import (
     NullMessage, ParamsUnmatched, ArgumentMissing, FuzzyMatchSuccess, CompletionTriggered, PauseTriggered
 )
 from ..args import Args, ArgUnit
-from ..base import Option, Subcommand, Sentence, StrMounter
-from ..arpamar import Arpamar
-from ..util import split_once, split
+from ..base import Option, Subcommand, Sentence, OptionResult, TokenTable, TokenStream, TokenizedMessage
+from ..arpamar import Arpamar, RejectedArpamar
+from ..util import split_spans
 from ..typing import DataCollection
 from ..config import config
 from ..components.output import output_manager
-from .parts import analyse_args, analyse_option, analyse_subcommand, analyse_header, analyse_unmatch_params
+from .parts import (
+    analyse_args, analyse_option, analyse_subcommand, analyse_header, analyse_unmatch_params, Failure, ArgsPattern
+)
 from .special import handle_help, handle_shortcut, handle_completion
 
 if TYPE_CHECKING:
@@ -35,11 +38,8 @@ class Analyser(Generic[T_Origin]):
 
     alconna: 'Alconna'  # Alconna实例
     context: Optional[Union[ArgUnit, Subcommand, Option]]
-    current_index: int  # 当前数据的index
-    content_index: int  # 内部index
     is_str: bool  # 是否是字符串
-    raw_data: List[Union[Any, StrMounter]]  # 原始数据
-    ndata: int  # 原始数据的长度
+    tokens: TokenStream  # 消息单元流
     command_params: Dict[str, Union[Sentence, List[Option], Subcommand]]
     param_ids: Set[str]
     # 命令头部
@@ -47,6 +47,7 @@ class Analyser(Generic[T_Origin]):
         Union[TPattern, BasePattern], List[Tuple[Any, TPattern]],
         Tuple[Union[Tuple[List[Any], TPattern], List[Any]], Union[TPattern, BasePattern]],
     ]
+    mixin_header: Optional[TPattern]  # 元素与文本混合的命令头中, 文本部分与命令名合并后的正则
     separators: Set[str]  # 分隔符
     raise_exception: bool  # 是否抛出异常
     options: Dict[str, Any]  # 存放解析到的所有选项
@@ -68,11 +69,39 @@ class Analyser(Generic[T_Origin]):
     default_separate: bool
     message_cache: bool
     fuzzy_match: bool
+    fast_reject: bool  # 命令头不匹配时是否直接返回共享的结果
+    compact_patterns: Dict[Option, List[TPattern]]  # 紧凑选项的预编译正则
+    kwonly_patterns: Dict[str, TPattern]  # 键值对参数的预编译正则
+    args_patterns: Dict[int, ArgsPattern]  # 只含正则参数的 Args 合并后的正则, 以 id(args) 为键
+    rejected: Optional[RejectedArpamar]
 
     @staticmethod
     def generate_token(data: List[Union[Any, List[str]]]) -> int:
         return hash(str(data))
 
+    @property
+    def current_index(self) -> int:
+        """当前单元的序号"""
+        return self.tokens.index
+
+    @current_index.setter
+    def current_index(self, value: int):
+        self.tokens.index = value
+
+    @property
+    def content_index(self) -> int:
+        """当前文本单元内的偏移"""
+        return self.tokens.offset
+
+    @content_index.setter
+    def content_index(self, value: int):
+        self.tokens.offset = value
+
+    @property
+    def ndata(self) -> int:
+        """消息单元的数量"""
+        return self.tokens.size
+
     def __init__(self, alconna: "Alconna"):
         if not hasattr(self, 'filter_out'):
             self.filter_out = []
@@ -88,8 +117,13 @@ class Analyser(Generic[T_Origin]):
         self.default_separate = True
         self.fuzzy_match = alconna.meta.fuzzy_match
         self.message_cache = alconna.namespace_config.enable_message_cache
+        self.fast_reject = alconna.namespace_config.fast_reject
+        self.rejected = None
         self.param_ids = set()
         self.command_params = {}
+        self.compact_patterns = {}
+        self.kwonly_patterns = {}
+        self.args_patterns = {}
         self.__handle_main_args__(alconna.args, alconna.nargs)
         self.__init_header__(alconna.command, alconna.headers)
         self.__init_actions__()
@@ -143,6 +177,7 @@ class Analyser(Generic[T_Origin]):
     ):
         if isinstance(command_name, str):
             command_name = self.__handle_bracket__(command_name)
+        self.mixin_header = None
 
         _command_name, _command_str = (
             (re.compile(command_name), command_name) if isinstance(command_name, str) else
@@ -172,6 +207,8 @@ class Analyser(Generic[T_Origin]):
                 self.command_header = (elements, _command_name)  # type: ignore
             else:
                 self.command_header = (elements, re.compile(f"(?:{ch_text[:-1]})")), _command_name # type: ignore # noqa
+                with suppress(re.error, TypeError):
+                    self.mixin_header = re.compile(f"(?:{ch_text[:-1]})" + _command_name.pattern)  # type: ignore
 
     def __init_actions__(self):
         actions = self.alconna.action_list
@@ -189,115 +226,97 @@ class Analyser(Generic[T_Origin]):
     def __repr__(self):
         return f"<{self.__class__.__name__} of {self.alconna.path}>"
 
+    def fork(self) -> "Analyser":
+        """
+        复制分析器以用于并发的解析
+
+        编译得到的数据 (命令参数表、预编译的正则与生成的解析函数等) 在副本间共享且只读, 解析状态则各自独立
+        """
+        other = copy(self)
+        for key, value in self.__dict__.items():
+            if isinstance(value, MethodType) and value.__self__ is self:
+                setattr(other, key, MethodType(value.__func__, other))
+        other.reset()
+        return other
+
     def reset(self):
         """重置分析器"""
-        self.current_index, self.content_index, self.ndata, self.temp_token = 0, 0, 0, 0
+        self.temp_token = 0
         self.is_str, self.head_matched = False, False
         self.temporary_data, self.main_args, self.options, self.subcommands = {}, {}, {}, {}
-        self.raw_data, self.sentences = [], []
+        self.tokens, self.sentences = TokenStream(TokenTable((), (), ())), []
         self.origin_data, self.header, self.context = None, None, None
         self.head_pos = (0, 0)
 
     def push(self, *data: Union[str, Any]):
-        for d in data:
-            if not d:
-                continue
-            if isinstance(d, str) and isinstance(self.raw_data[-1], StrMounter):
-                if self.current_index == self.ndata:
-                    self.current_index -= 1
-                    self.content_index = len(self.raw_data[-1]) - 1
-                self.raw_data[-1].append(d)
-            else:
-                self.raw_data.append(StrMounter([d]) if isinstance(d, str) else d)
-                self.ndata += 1
+        self.tokens.push(*data)
         return self
 
     def popitem(self, separate: Optional[Set[str]] = None, move: bool = True) -> Tuple[Union[str, Any], bool]:
         """获取解析需要的下个数据"""
-        if self.current_index == self.ndata:
-            return "", True
-        _current_data = self.raw_data[self.current_index]
-        if isinstance(_current_data, StrMounter):
-            _rest_text: str = ""
-            _text = _current_data[self.content_index]
-            if separate and not self.separators.issuperset(separate):
-                _text, _rest_text = split_once(_text, tuple(separate))
-            if move:
-                self.content_index += 1
-                if _rest_text:
-                    _current_data[self.content_index - 1] = _text
-                    _current_data.insert(self.content_index, _rest_text)
-            if len(_current_data) == self.content_index:
-                self.current_index += 1
-                self.content_index = 0
-            return _text, True
-        if move:
-            self.current_index += 1
-        return _current_data, False
+        return self.tokens.pop(
+            tuple(separate) if separate and not self.separators.issuperset(separate) else None, move
+        )
 
     def pushback(self, data: Union[str, Any], replace=False):
         """把 pop的数据放回 (实际只是‘指针’移动)"""
-        if not data:
-            return
-        if self.current_index >= 1:
-            self.current_index -= 1
-        _current_data = self.raw_data[self.current_index]
-        if isinstance(_current_data, StrMounter):
-            if self.content_index == 0:
-                self.content_index = len(_current_data) - 1
-            else:
-                self.content_index -= 1
-        if replace:
-            if isinstance(data, str):
-                _current_data[self.content_index] = data
-            else:
-                self.raw_data[self.current_index] = data
+        self.tokens.pushback(data, replace)
 
     def release(self, separate: Optional[Set[str]] = None, recover: bool = False) -> List[Union[str, Any]]:
-        _result = []
-        is_cur = False
-        for _data in self.raw_data[0 if recover else self.current_index:]:
-            if isinstance(_data, StrMounter):
-                for s in _data[0 if is_cur or recover else self.content_index:]:
-                    if separate and not self.separators.issuperset(separate):
-                        _result.extend(split(s, tuple(separate)))
-                    else:
-                        _result.append(s)
-                    is_cur = True
-            else:
-                _result.append(_data)
-        return _result
+        return self.tokens.release(
+            tuple(separate) if separate and not self.separators.issuperset(separate) else None, recover
+        )
 
-    def process(self, data: DataCollection[Union[str, Any]]) -> 'Analyser':
-        """命令分析功能, 传入字符串或消息链, 应当在失败时返回fail的arpamar"""
-        self.origin_data = data
-        if isinstance(data, str):
-            self.is_str = True
-            data = [data]
-        i, exc = 0, None
-        keep_crlf = not self.alconna.meta.keep_crlf
-        raw_data = self.raw_data
-        for unit in data:
-            if (uname := unit.__class__.__name__) in self.filter_out:
+    def remaining(self, separate: Optional[Set[str]] = None) -> int:
+        """剩余的单元数"""
+        return self.tokens.remaining(
+            tuple(separate) if separate and not self.separators.issuperset(separate) else None
+        )
+
+    @classmethod
+    def tokenize(
+        cls, data: DataCollection[Union[str, Any]], separators: FrozenSet[str], crlf: bool
+    ) -> TokenTable:
+        """按照该分析器的预处理规则切分消息"""
+        sources, starts, ends = [], [], []
+        filter_out = getattr(cls, 'filter_out', [])
+        seps = tuple(separators)
+        for unit in ([data] if isinstance(data, str) else data):
+            if (uname := unit.__class__.__name__) in filter_out:
                 continue
-            if (proc := self.preprocessors.get(uname)) and (res := proc(unit)):
+            if (proc := cls.preprocessors.get(uname)) and (res := proc(unit)):
                 unit = res
-            if text := getattr(unit, self.text_sign, unit if isinstance(unit, str) else None):
-                if not (res := split(text.strip(), tuple(self.separators), keep_crlf)):
-                    continue
-                raw_data.append(StrMounter(res))
+            if text := getattr(unit, cls.text_sign, unit if isinstance(unit, str) else None):
+                source, spans = split_spans(text.strip(), seps, crlf)
+                for start, end in spans:
+                    sources.append(source)
+                    starts.append(start)
+                    ends.append(end)
             else:
-                raw_data.append(unit)
-            i += 1
-        if i < 1:
-            exp = NullMessage(config.lang.analyser_handle_null_message.format(target=data))
+                sources.append(unit)
+                starts.append(-1)
+                ends.append(-1)
+        return TokenTable(tuple(sources), tuple(starts), tuple(ends))
+
+    def process(self, data: Union[DataCollection[Union[str, Any]], TokenizedMessage]) -> 'Analyser':
+        """命令分析功能, 传入字符串或消息链, 应当在失败时返回fail的arpamar"""
+        return self.process_tokens(data if isinstance(data, TokenizedMessage) else TokenizedMessage(data))
+
+    def process_tokens(self, tokens: TokenizedMessage) -> 'Analyser':
+        """传入预先切分好的消息, 同一个 TokenizedMessage 可以在多个分析器间共享"""
+        data = self.origin_data = tokens.origin
+        self.is_str = isinstance(data, str)
+        key = (self.__class__, frozenset(self.separators), not self.alconna.meta.keep_crlf)
+        table = tokens.table(*key)
+        if not table.sources:
+            exp = NullMessage(config.lang.analyser_handle_null_message.format(target=[data] if self.is_str else data))
             if self.raise_exception:
                 raise exp
             self.temporary_data["fail"] = exp
-        else:
-            self.ndata = i
-            if self.message_cache:
-                self.temp_token = self.generate_token(raw_data)
+            return self
+        self.tokens = TokenStream(table)
+        if self.message_cache:
+            self.temp_token = tokens.token(*key)
         return self
 
     _special = {
@@ -326,104 +345,164 @@ class Analyser(Generic[T_Origin]):
             return res
         try:
             self.header = analyse_header(self)
-            self.head_pos = self.current_index, self.content_index
-        except ParamsUnmatched as e:
-            self.current_index = 0
-            self.content_index = 0
-            try:
-                _res = command_manager.find_shortcut(self.popitem(move=False)[0], self.alconna)
-                self.reset()
-                if isinstance(_res, Arpamar):
-                    return _res
-                return self.process(_res).analyse()
-            except ValueError as exc:
-                if self.raise_exception:
-                    raise e from exc
-                return self.export(fail=True, exception=e)
         except FuzzyMatchSuccess as Fuzzy:
             output_manager.get(self.alconna.name, lambda: str(Fuzzy)).handle(raise_exception=self.raise_exception)
-            return self.export(fail=True)
+            return self.export(fail=True, exception=Fuzzy)
+        if isinstance(self.header, Failure):
+            fail, self.header = self.header, None
+            return self.header_mismatch(fail)
+        self.head_pos = self.current_index, self.content_index
 
         for _ in self.part_len:
             try:
-                _text, _str = self.popitem(move=False)
-                _param = _param if (_param := (self.command_params.get(_text) if _str and _text else Ellipsis)) else (
-                    None if self.default_separate else analyse_unmatch_params(
-                        self.command_params.values(), _text, self.fuzzy_match
-                    )
-                )
-                if (not _param or _param is Ellipsis) and not self.main_args:
-                    self.main_args = analyse_args(self, self.self_args)
-                elif isinstance(_param, list):
-                    for opt in _param:
-                        if handler := self._special.get(opt.name):
-                            return handler(self)
-                        _current_index, _content_index = self.current_index, self.content_index
-                        try:
-                            opt_n, opt_v = analyse_option(self, opt)
-                            self.options[opt_n] = opt_v
-                            break
-                        except Exception as e:
-                            exc = e
-                            self.current_index, self.content_index = _current_index, _content_index
-                            continue
-                    else:
-                        raise exc  # type: ignore  # noqa
-                elif isinstance(_param, Subcommand):
-                    self.subcommands.setdefault(*analyse_subcommand(self, _param))
-                elif isinstance(_param, Sentence):
-                    self.sentences.append(self.popitem()[0])
+                res = self.analyse_param(*self.popitem(move=False))
             except FuzzyMatchSuccess as e:
                 output_manager.get(self.alconna.name, lambda: str(e)).handle(raise_exception=self.raise_exception)
-                return self.export(fail=True)
+                return self.export(fail=True, exception=e)
             except CompletionTriggered as comp:
                 return handle_completion(self, comp.args[0])
             except (ParamsUnmatched, ArgumentMissing) as e1:
-                if rest := self.release():
-                    if rest[-1] in ("--comp", "-cp"):
-                        return handle_completion(self, self.context)
-                    if handler := self._special.get(rest[-1]):
-                        return handler(self)
-                if interrupt and isinstance(e1, ArgumentMissing):
-                    raise PauseTriggered from e1
-                if self.raise_exception:
-                    raise
-                return self.export(fail=True, exception=e1)
+                res = Failure(e1)
+            if res.__class__ is Failure:
+                return self.param_mismatch(res, interrupt)
+            if res is not None:
+                return res
             if self.current_index == self.ndata:
                 break
 
         # 防止主参数的默认值被忽略
         if self.default_main_only and not self.main_args:
-            self.main_args = analyse_args(self, self.self_args)
+            if isinstance(main_args := analyse_args(self, self.self_args), Failure):
+                raise main_args.exception()
+            self.main_args = main_args
 
         if self.current_index == self.ndata and (not self.need_main_args or self.main_args):
             return self.export()
+        return self.params_incomplete(interrupt)
+
+    def param_mismatch(self, fail: Failure, interrupt: bool = False) -> Arpamar:
+        """参数解析失败时, 若其后跟随特殊选项则交由其处理, 否则返回失败的结果"""
+        if rest := self.release():
+            if rest[-1] in ("--comp", "-cp"):
+                return handle_completion(self, self.context)
+            if handler := self._special.get(rest[-1]):
+                self.temporary_data['exception'] = fail  # 特殊选项导出的结果以此作为错误信息
+                return handler(self)
+        if interrupt and fail.error_type is ArgumentMissing:
+            raise PauseTriggered from fail.exception()
+        if self.raise_exception:
+            raise fail.exception()
+        return self.export(fail=True, exception=fail)
 
+    def params_incomplete(self, interrupt: bool = False) -> Arpamar:
+        """解析结束时仍有未解析的单元或缺少主参数, 返回失败的结果"""
         rest = self.release()
         if len(rest) > 0:
             if rest[-1] in ("--comp", "-cp"):
                 return handle_completion(self, rest[-2])
-            exc = ParamsUnmatched(config.lang.analyser_param_unmatched.format(target=self.popitem(move=False)[0]))
+            fail = Failure(ParamsUnmatched, "analyser.param_unmatched", target=self.popitem(move=False)[0])
         else:
-            exc = ArgumentMissing(config.lang.analyser_param_missing)
-        if interrupt and isinstance(exc, ArgumentMissing):
+            fail = Failure(ArgumentMissing, "analyser.param_missing")
+        if interrupt and fail.error_type is ArgumentMissing:
             raise PauseTriggered
         if self.raise_exception:
-            raise exc
-        return self.export(fail=True, exception=exc)
+            raise fail.exception()
+        return self.export(fail=True, exception=fail)
+
+    def header_mismatch(self, fail: Failure) -> Arpamar:
+        """命令头不匹配时尝试匹配快捷指令, 否则返回失败的结果"""
+        self.current_index = 0
+        self.content_index = 0
+        if self.raise_exception:
+            try:
+                _res = command_manager.find_shortcut(self.popitem(move=False)[0], self.alconna)
+            except ValueError as exc:
+                raise fail.exception() from exc
+        elif (_res := command_manager.get_shortcut(self.popitem(move=False)[0], self.alconna)) is None:
+            if self.fast_reject:
+                self.reset()
+                if not self.rejected:
+                    self.rejected = RejectedArpamar(self.alconna)
+                return self.rejected
+            return self.export(fail=True, exception=fail)
+        self.reset()
+        if isinstance(_res, Arpamar):
+            return _res
+        return self.process(_res).analyse()
+
+    def analyse_param(self, text: Union[str, Any], is_str: bool) -> Union[Arpamar, Failure, None]:
+        """依据下一个单元解析一个选项、子命令或主参数; 触发特殊选项时返回其结果, 失败时返回 Failure"""
+        _param = _param if (_param := (self.command_params.get(text) if is_str and text else Ellipsis)) else (
+            None if self.default_separate else analyse_unmatch_params(
+                self.command_params.values(), text, self.fuzzy_match
+            )
+        )
+        if (not _param or _param is Ellipsis) and not self.main_args:
+            if isinstance(main_args := analyse_args(self, self.self_args), Failure):
+                return main_args
+            self.main_args = main_args
+        elif isinstance(_param, list):
+            return self.analyse_options(_param)
+        elif isinstance(_param, Subcommand):
+            if isinstance(res := analyse_subcommand(self, _param), Failure):
+                return res
+            self.subcommands.setdefault(*res)
+        elif isinstance(_param, Sentence):
+            self.sentences.append(self.popitem()[0])
+
+    def analyse_options(
+        self, options: List[Option], result: Optional[Dict[str, OptionResult]] = None
+    ) -> Union[Arpamar, Failure, None]:
+        """
+        依次尝试共用同一别名的选项, 直到其中之一解析成功; 全部失败时返回最后的 Failure
+
+        result 为空时结果写入命令的选项, 触发特殊选项时返回其结果; 否则结果写入 result (子命令的选项), 且不处理特殊选项
+        """
+        for opt in options:
+            if result is None and (handler := self._special.get(opt.name)):
+                return handler(self)
+            _current_index, _content_index = self.current_index, self.content_index
+            try:
+                if not isinstance(res := analyse_option(self, opt), Failure):
+                    if result is None:
+                        self.options[res[0]] = res[1]
+                    else:
+                        result.setdefault(*res)
+                    return None
+                exc = res
+            except Exception as e:
+                exc = e
+            self.current_index, self.content_index = _current_index, _content_index
+        if isinstance(exc, Failure):  # type: ignore  # noqa
+            return exc
+        raise exc  # type: ignore  # noqa
+
+    def __post_compile__(self):
+        """命令参数编译完成后调用, 子类可在此预先构建解析所需的数据"""
 
     @staticmethod
     def converter(command: str) -> T_Origin:
         return command  # type: ignore
 
-    def export(self, exception: Optional[BaseException] = None, fail: bool = False) -> Arpamar[T_Origin]:
+    def export(
+        self, exception: Union[BaseException, Failure, None] = None, fail: bool = False
+    ) -> Arpamar[T_Origin]:
         """创建arpamar, 其一定是一次解析的最后部分"""
         result = Arpamar(self.alconna)
         result.head_matched = self.head_matched
         result.matched = not fail
         if fail:
-            result.error_info = repr(exception or traceback.format_exc(limit=1))
-            result.error_data = self.release()
+            if exception is None:
+                exception = self.temporary_data.get('exception')
+            if isinstance(exception, Failure) and isinstance(exception.error, type):
+                result.lazy_error(lambda: repr(exception.exception()), self.tokens.release)  # type: ignore
+            else:
+                # 异常实例在此立即格式化, 结果不持有其 traceback 及其引用的栈帧
+                info = repr(
+                    "NoneType: None\n" if exception is None else
+                    exception.exception() if isinstance(exception, Failure) else exception
+                )
+                result.lazy_error(lambda: info, self.tokens.release)
         else:
             result.encapsulate_result(self.header, self.main_args, self.options, self.subcommands)
             if self.message_cache:
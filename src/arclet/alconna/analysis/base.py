@@ -1,8 +1,12 @@
 from collections import namedtuple
-from typing import TYPE_CHECKING, Union, Callable, List, Any, Tuple, Dict
+from types import MethodType
+from typing import TYPE_CHECKING, Union, Callable, List, Any, Tuple, Dict, Optional
 import traceback
 
 from .analyser import Analyser
+from .codegen import generate
+from .tiers import select
+from .parts import Failure, args_pattern, compact_patterns, kwonly_pattern
 from .parts import analyse_args as ala, analyse_header as alh, analyse_option as alo, analyse_subcommand as als
 from ..typing import DataCollection, TDataCollection
 from ..base import Option, Subcommand, Sentence
@@ -22,9 +26,21 @@ def _compile_opts(option: Option, data: Dict[str, Union[Sentence, List[Option]]]
             data[alias] = [option]
 
 
+def _compile_patterns(analyser: "Analyser", args: Args, option: Optional[Option] = None):
+    """预编译解析时需要的正则"""
+    for key, arg in args.argument.items():
+        if arg['kwonly']:
+            analyser.kwonly_patterns.setdefault(key, kwonly_pattern(key))
+    if pattern := args_pattern(args, analyser.separators):
+        analyser.args_patterns[id(args)] = pattern
+    if option and option.is_compact:
+        analyser.compact_patterns[option] = compact_patterns(option)
+
+
 def default_params_parser(analyser: "Analyser"):
     require_len = 0
     for opts in analyser.alconna.options:
+        _compile_patterns(analyser, opts.args, opts if isinstance(opts, Option) else None)
         if isinstance(opts, Option):
             _compile_opts(opts, analyser.command_params)  # type: ignore
             analyser.param_ids.update(opts.aliases)
@@ -33,6 +49,7 @@ def default_params_parser(analyser: "Analyser"):
             analyser.command_params[opts.name] = opts
             analyser.param_ids.add(opts.name)
             for sub_opts in opts.options:
+                _compile_patterns(analyser, sub_opts.args, sub_opts)
                 _compile_opts(sub_opts, opts.sub_params)
                 if sub_opts.requires:
                     sub_require_len = max(len(sub_opts.requires), sub_require_len)
@@ -52,9 +69,29 @@ def default_params_parser(analyser: "Analyser"):
         )
 
 
-def compile(alconna: "Alconna", params_parser: Callable[[Analyser], None] = default_params_parser) -> Analyser:
+def compile(
+    alconna: "Alconna",
+    params_parser: Callable[[Analyser], None] = default_params_parser,
+    codegen: Optional[bool] = None,
+    tiered: bool = True
+) -> Analyser:
+    """
+    编译命令, 返回对应的分析器
+
+    Args:
+        alconna: 目标命令
+        params_parser: 处理命令参数的函数
+        codegen: 是否为命令生成专用的解析函数, 默认取决于 alconna.meta.codegen
+        tiered: 是否依据命令的结构选择简化的解析流程
+    """
     _analyser = alconna.analyser_type(alconna)
+    _compile_patterns(_analyser, _analyser.self_args)
     params_parser(_analyser)
+    _analyser.__post_compile__()
+    if (alconna.meta.codegen if codegen is None else codegen) and (func := generate(_analyser)):
+        _analyser.analyse = MethodType(func, _analyser)  # type: ignore
+    elif tiered and (func := select(_analyser)):
+        _analyser.analyse = MethodType(func, _analyser)  # type: ignore
     return _analyser
 
 
@@ -76,6 +113,10 @@ class _DummyAnalyser(Analyser):
     def __new__(cls, *args, **kwargs):
         cls.alconna = cls._DummyALC()  # type: ignore
         cls.command_params = {}
+        cls.compact_patterns = {}
+        cls.kwonly_patterns = {}
+        cls.args_patterns = {}
+        cls.mixin_header = None
         cls.param_ids = set()
         cls.default_separate = True
         cls.context = None
@@ -94,7 +135,9 @@ def analyse_args(args: Args, command: DataCollection[Union[str, Any]], raise_exc
     _analyser.raise_exception = True
     try:
         _analyser.process(command)
-        return ala(_analyser, args)
+        if isinstance(res := ala(_analyser, args), Failure):
+            raise res.exception()
+        return res
     except Exception as e:
         if raise_exception:
             traceback.print_exception(AnalyseError, e, e.__traceback__)
@@ -116,7 +159,9 @@ def analyse_header(
     _analyser.__init_header__(command_name, headers)
     try:
         _analyser.process(command)
-        return alh(_analyser)
+        if isinstance(res := alh(_analyser), Failure):
+            raise res.exception()
+        return res
     except Exception as e:
         if raise_exception:
             traceback.print_exception(AnalyseError, e, e.__traceback__)
@@ -134,7 +179,9 @@ def analyse_option(option: Option, command: DataCollection[Union[str, Any]], rai
     _analyser.alconna.options.clear()
     try:
         _analyser.process(command)
-        return alo(_analyser, option)
+        if isinstance(res := alo(_analyser, option), Failure):
+            raise res.exception()
+        return res
     except Exception as e:
         if raise_exception:
             traceback.print_exception(AnalyseError, e, e.__traceback__)
@@ -152,7 +199,9 @@ def analyse_subcommand(subcommand: Subcommand, command: DataCollection[Union[str
     _analyser.alconna.options.clear()
     try:
         _analyser.process(command)
-        return als(_analyser, subcommand)
+        if isinstance(res := als(_analyser, subcommand), Failure):
+            raise res.exception()
+        return res
     except Exception as e:
         if raise_exception:
             traceback.print_exception(AnalyseError, e, e.__traceback__)
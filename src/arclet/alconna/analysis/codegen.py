@@ -0,0 +1,262 @@
+"""将单个命令编译为专用的 Python 解析函数"""
+from typing import Any, Dict, List, Optional, Callable
+from nepattern import BasePattern, Empty
+from nepattern.util import TPattern
+
+from ..args import Args
+from ..base import Option, Subcommand, TokenStream
+from ..exceptions import ParamsUnmatched, ArgumentMissing, CompletionTriggered
+from ..typing import MultiArg
+from ..manager import command_manager
+from .analyser import Analyser
+from .parts import analyse_args, analyse_option, analyse_subcommand, analyse_header, Failure
+from .special import handle_completion
+
+
+class _Source:
+    """生成代码时使用的缓冲区, 同时记录代码中引用的外部对象"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.names: Dict[str, Any] = {
+            "_Empty": Empty, "_alh": analyse_header, "_ala": analyse_args, "_alo": analyse_option,
+            "_als": analyse_subcommand, "_is_disable": command_manager.is_disable, "_retry": _retry,
+            "_expect": _expect, "_Failure": Failure, "_Fail": _Fail, "_Unsupported": _Unsupported,
+            "_PU": ParamsUnmatched, "_AM": ArgumentMissing, "_CT": CompletionTriggered, "_hc": handle_completion,
+        }
+
+    def ref(self, obj: Any) -> str:
+        name = f"_r{len(self.names)}"
+        self.names[name] = obj
+        return name
+
+    def add(self, indent: int, *lines: str):
+        self.lines.extend("    " * indent + line for line in lines)
+
+
+class _Fail(Exception):
+    """携带 Failure, 使生成的函数中止并报告该失败"""
+
+
+class _Unsupported(Exception):
+    """生成的函数遇到其不处理的结构 (如句子与特殊选项), 需交由通用的 analyse 重新解析"""
+
+
+def _retry(analyser: Analyser, message, interrupt: bool):
+    """生成的函数无法处理时, 恢复分析器状态并交由通用的 analyse 重新解析"""
+    analyser.tokens = TokenStream(analyser.tokens.table)
+    analyser.header, analyser.head_matched, analyser.context = None, False, None
+    analyser.main_args, analyser.options, analyser.subcommands, analyser.sentences = {}, {}, {}, []
+    analyser.head_pos = (0, 0)
+    return analyser.__class__.analyse(analyser, message, interrupt)
+
+
+def _expect(result):
+    """parts 中的函数返回 Failure 时中止生成的函数"""
+    if result.__class__ is Failure:
+        raise _Fail(result)
+    return result
+
+
+def _inline_args(analyser: Analyser, args: Args) -> bool:
+    return (
+        analyser.separators.issuperset(args.separators) and
+        not (args.var_positional or args.var_keyword or args.keyword_only) and
+        all(
+            isinstance(arg['value'], BasePattern) and arg['value'].__class__ is not MultiArg and not arg['kwonly']
+            for arg in args.argument.values()
+        )
+    )
+
+
+def _inline_option(analyser: Analyser, option: Option) -> bool:
+    return (
+        not option.is_compact and not option.requires and analyser.separators.issuperset(option.separators)
+        and option.name not in analyser._special and _inline_args(analyser, option.args)
+    )
+
+
+def _gen_args(src: _Source, analyser: Analyser, args: Args) -> str:
+    """生成解析一组参数的函数, 与 parts.analyse_args 的行为一致; 返回函数名"""
+    name = f"_args{len(src.names)}"
+    src.names[name] = None
+    ids = src.ref(analyser.param_ids)
+    src.add(0, f"def {name}(self, tokens):", "    result = {}")
+    for key, arg in args.argument.items():
+        _field = arg['field']
+        default = src.ref(_field.default) if _field.default is not None else f"{src.ref(_field)}.default_factory()"
+        value = arg['value']
+        if arg['validator']:
+            check = f"flag, res = {src.ref(arg['validator'])}(may_arg, {default})"
+        else:
+            check = f"flag, res = (_res := {src.ref(value)}(may_arg, {default})).flag, _res.value"
+        missing = "pass" if arg['optional'] else f"raise _Fail(_Failure(_AM, 'args.missing', key={key!r}))"
+        error = "pass" if arg['optional'] else "raise _Fail(_Failure(_PU(*res.args)))"
+        unit = src.ref(arg)
+        src.add(
+            1,
+            f"self.context = {unit}",
+            "may_arg, is_str = tokens.pop()",
+            "if may_arg in ('--comp', '-cp'):",
+            f"    raise _CT({unit})",
+            f"if not may_arg or (is_str and may_arg in {ids}):",
+            "    tokens.pushback(may_arg)",
+            f"    default = {default}",
+            "    if default is None:",
+            f"        {missing}",
+            "    else:",
+            f"        result[{key!r}] = None if default is _Empty else default",
+            "else:",
+            f"    {check}",
+            "    if flag != 'valid':",
+            "        tokens.pushback(may_arg)",
+            "    if flag == 'error':",
+            f"        {error}",
+        )
+        if key[0] != '$':
+            src.add(2, "else:", f"    result[{key!r}] = res")
+    src.add(1, "return result")
+    return name
+
+
+def generate(analyser: Analyser) -> Optional[Callable[..., Any]]:
+    """
+    为分析器生成专用的 analyse 函数
+
+    命令头、选项分支与参数校验被展开为直线代码; 遇到不支持的结构时调用 parts 中的通用函数.
+    解析失败时以与通用流程相同的 Failure 调用 header_mismatch、param_mismatch 或 params_incomplete,
+    只有句子、特殊选项等不被展开的单元才回退到通用的 analyse 重新解析, 因此解析结果与错误信息与通用流程一致
+
+    Returns:
+        Optional[Callable]: 生成的函数; 命令本身不适合编译时返回 None
+    """
+    if analyser.fuzzy_match or not analyser.default_separate:
+        return
+    if (cls := analyser.__class__).analyse is not Analyser.analyse or cls.analyse_param is not Analyser.analyse_param:
+        return
+    src = _Source()
+    src.names["_generic"] = analyser.__class__.analyse
+    main = (
+        f"{_gen_args(src, analyser, analyser.self_args)}(self, tokens)" if _inline_args(analyser, analyser.self_args)
+        else f"_expect(_ala(self, {src.ref(analyser.self_args)}))"
+    )
+    branches: List[str] = []
+    fallback = set()
+    seen = set()
+    for key, target in analyser.command_params.items():
+        if isinstance(target, Subcommand):
+            branches.extend((
+                f"if text == {key!r}:",
+                f"    self.subcommands.setdefault(*_expect(_als(self, {src.ref(target)})))",
+            ))
+        elif isinstance(target, list) and len(target) == 1 and target[0].name in analyser._special:
+            branches.extend((f"if text == {key!r}:", f"    return {src.ref(analyser._special[target[0].name])}(self)"))
+        elif isinstance(target, list) and len(target) == 1:
+            if id(opt := target[0]) in seen:
+                continue
+            seen.add(id(opt))
+            # 与 Analyser.analyse_param 一致, 选项解析失败时恢复到选项名之前的位置
+            branches.extend((
+                f"if text in {src.ref(opt.aliases)}:",
+                "    pos = tokens.index, tokens.offset",
+                "    try:",
+            ))
+            if not _inline_option(analyser, opt):
+                branches.append(f"        self.options.__setitem__(*_expect(_alo(self, {src.ref(opt)})))")
+            else:
+                value = (
+                    "{'value': Ellipsis, 'args': {}}" if opt.nargs == 0 else
+                    f"{{'value': None, 'args': {_gen_args(src, analyser, opt.args)}(self, tokens)}}"
+                )
+                branches.extend((
+                    f"        self.context = {src.ref(opt)}",
+                    "        tokens.pop()",
+                    f"        self.options[{opt.dest!r}] = {value}",
+                ))
+            branches.extend((
+                "    except Exception:",
+                "        tokens.index, tokens.offset = pos",
+                "        raise",
+            ))
+        else:
+            fallback.add(key)
+    header = analyser.command_header
+    src.add(
+        0,
+        "def analyse(self, message=None, interrupt=False):",
+        "    tokens = self.tokens",
+        "    if (",
+        "        interrupt or self.temporary_data or not tokens.size or tokens.index or tokens.offset or",
+        "        (self.message_cache and self.temp_token in self.used_tokens) or _is_disable(self.alconna)",
+        "    ):",
+        "        return _generic(self, message, interrupt)",
+    )
+    if isinstance(header, TPattern):
+        src.add(
+            1,
+            "head, is_str = tokens.pop()",
+            f"if not is_str or not (mat := {src.ref(header)}.fullmatch(head)):",
+            "    return self.header_mismatch(_Failure(_PU, 'header.error', target=head))",
+            "self.head_matched = True",
+            "self.header = mat.groupdict() or True",
+        )
+    else:
+        src.add(
+            1,
+            "if (header := _alh(self)).__class__ is _Failure:",
+            "    return self.header_mismatch(header)",
+            "self.header = header",
+        )
+    src.add(
+        1,
+        "self.head_pos = tokens.index, tokens.offset",
+        "try:",
+        "    for _ in self.part_len:",
+        "        text, is_str = tokens.pop(None, False)",
+        "        if is_str and text:",
+    )
+    if fallback:
+        src.add(4, f"if text in {src.ref(frozenset(fallback))}:", "    raise _Unsupported")
+    for i, line in enumerate(branches):
+        src.add(4, f"el{line}" if line.startswith("if ") and (i or fallback) else line)
+    src.add(4, "else:" if branches or fallback else "if True:")
+    src.add(
+        3,
+        "        if not self.main_args:",
+        f"            self.main_args = {main}",
+        "elif not self.main_args:",
+        f"    self.main_args = {main}",
+        "if tokens.index == tokens.size:",
+        "    break",
+    )
+    src.add(
+        1,
+        "except _Fail as e:",
+        "    return self.param_mismatch(e.args[0])",
+        "except (_PU, _AM) as e:",
+        "    return self.param_mismatch(_Failure(e))",
+        "except _CT as e:",
+        "    return _hc(self, e.args[0])",
+        "except _Unsupported:",
+        "    return _retry(self, message, interrupt)",
+    )
+    if analyser.default_main_only:
+        # 与通用流程一致, 主参数的默认值解析失败时直接抛出异常
+        src.add(
+            1,
+            "if not self.main_args:",
+            "    try:",
+            f"        self.main_args = {main}",
+            "    except _Fail as e:",
+            "        raise e.args[0].exception() from None",
+        )
+    src.add(
+        1,
+        f"if tokens.index == tokens.size{' and self.main_args' if analyser.need_main_args else ''}:",
+        "    return self.export()",
+        "return self.params_incomplete()",
+    )
+    namespace = dict(src.names)
+    exec("\n".join(src.lines), namespace)  # noqa: S102
+    return namespace["analyse"]
+
@@ -1,12 +1,13 @@
 import re
+from collections import deque
 from inspect import isclass
-from typing import Iterable, Union, List, Any, Dict, Tuple, TYPE_CHECKING
-from nepattern import AllParam, Empty, BasePattern
+from typing import Iterable, Union, List, Any, Dict, Deque, Tuple, Type, Optional, Set, NamedTuple, TYPE_CHECKING
+from nepattern import AllParam, Empty, BasePattern, PatternModel, UnionArg
 from nepattern.util import TPattern
 
 from ..exceptions import ParamsUnmatched, ArgumentMissing, FuzzyMatchSuccess, CompletionTriggered
 from ..typing import MultiArg
-from ..args import Args
+from ..args import Args, ArgUnit, ArgCache, ArgLazy
 from ..base import Option, Subcommand, OptionResult, SubcommandResult, Sentence
 from ..util import levenshtein_norm, split_once
 from ..config import config
@@ -14,6 +15,214 @@ from ..config import config
 if TYPE_CHECKING:
     from .analyser import Analyser
 
+_kwarg_pair = re.compile(r'^([^=]+)=([^=]+?)$')
+_kwarg_key = re.compile(r'^([^=]+)=\s?$')
+
+
+def compact_patterns(option: Option) -> List[TPattern]:
+    """紧凑选项的各别名对应的正则, 用于从单元中分离出选项名与剩余部分"""
+    return [re.compile(f"{al}(?P<rest>.*?)") for al in option.aliases]
+
+
+def kwonly_pattern(key: str) -> TPattern:
+    """键值对参数对应的正则"""
+    return re.compile(f'^{key}=(.*)$')
+
+
+_wrapped = (ArgCache, ArgLazy)
+"""需要由校验函数自身完成转换的参数单元, 合并后的正则不能越过它们"""
+_unsafe = re.compile(r"(?<!\[)\^|\$|\\[bBAZ\d]|\(\?(?:<?[=!]|P=)")
+
+
+def _top_branch(pattern: str) -> bool:
+    """正则的顶层是否含有分支; 此时 ^pattern$ 与整体匹配的结果可能不同"""
+    depth, escape, klass = 0, False, False
+    for c in pattern:
+        if escape:
+            escape = False
+        elif c == '\\':
+            escape = True
+        elif klass:
+            klass = c != ']'
+        elif c == '[':
+            klass = True
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and not depth:
+            return True
+    return False
+
+
+class ArgsPattern(NamedTuple):
+    """由只含正则参数的 Args 合并而成的单个正则"""
+    pattern: TPattern
+    quoted: TPattern
+    """消息含有引号或转义符时使用的正则, 此时单元间以 \\0 分隔"""
+    groups: Tuple[int, ...]
+    """各参数在正则中的分组序号"""
+    units: Tuple[Tuple[str, ArgUnit, int], ...]
+    """参数名, 参数单元与转换时取值的分组序号; 序号为 -1 时需以参数自身的正则取值"""
+
+
+def args_pattern(args: Args, separators: Set[str]) -> Optional[ArgsPattern]:
+    """将只由正则参数组成的 Args 合并为单个正则, 每个参数对应一个命名分组; 无法合并时返回 None"""
+    if not args.argument or args.var_positional or args.var_keyword or args.keyword_only:
+        return
+    if not separators.issuperset(args.separators):
+        return
+    seps = sorted(separators | {"\n", "\r"}, key=len, reverse=True)
+    sep = f"(?:{'|'.join(map(re.escape, seps))})+"
+    parts = []
+    for i, arg in enumerate(args.argument.values()):
+        value = arg['value']
+        if arg['kwonly']:
+            return
+        if value.__class__ is UnionArg and arg['validator']:
+            parts.append(f"(?P<_arg{i}>.+?)")  # 常量集合由校验函数查找, 不展开为正则
+            continue
+        if value.__class__ is UnionArg:
+            if value.anti or value.validators or value.for_validate or not value.for_equal:  # type: ignore
+                return
+            if not all(isinstance(eq, str) and eq for eq in value.for_equal):  # type: ignore
+                return
+            choices = sorted(value.for_equal, key=len, reverse=True)  # type: ignore
+            parts.append(f"(?P<_arg{i}>{'|'.join(map(re.escape, choices))})")
+            continue
+        if value.__class__ is not BasePattern:
+            return
+        if value.anti or value.previous or value.model == PatternModel.TYPE_CONVERT:  # type: ignore
+            return
+        if value.accepts and str not in value.accepts:  # type: ignore
+            return
+        if value.origin not in (str, Any) and (not isclass(value.origin) or issubclass(str, value.origin)):
+            return
+        if value.model == PatternModel.KEEP:
+            parts.append(f"(?P<_arg{i}>.+?)")
+        elif _unsafe.search(value.pattern):
+            return
+        else:
+            parts.append(f"(?P<_arg{i}>{value.pattern})")
+    try:
+        pattern = re.compile(sep.join(parts) + f"(?={sep}|$)")
+        quoted = re.compile("\0".join(parts) + "(?=\0|$)")
+    except re.error:
+        return
+    groups = tuple(pattern.groupindex[f"_arg{i}"] for i in range(len(parts)))
+    units = []
+    for group, (key, arg) in zip(groups, args.argument.items()):
+        value = arg['value']
+        if value.model == PatternModel.KEEP:
+            units.append((key, arg, group))
+        elif _top_branch(value.pattern):
+            units.append((key, arg, -1))
+        else:
+            units.append((key, arg, group + 1 if value.regex_pattern.groups else group))
+    return ArgsPattern(pattern, quoted, groups, tuple(units))
+
+
+def analyse_args_pattern(analyser: 'Analyser', pattern: ArgsPattern) -> Optional[Dict[str, Any]]:
+    """
+    以合并后的正则一次匹配所有参数, 结果与 analyse_args 一致
+
+    Returns:
+        Optional[Dict]: 解析结果; 无法由正则完成时返回 None, 此时分析器的状态不变
+    """
+    tokens = analyser.tokens
+    if (index := tokens.index) == tokens.size:
+        return
+    source = tokens.table.sources[index]
+    regex = pattern.quoted if isinstance(source, str) and "\0" in source else pattern.pattern
+    if not (mat := tokens.match(regex, pattern.groups)):
+        return
+    result = {}
+    for (key, arg, inner), group in zip(pattern.units, pattern.groups):
+        value = arg['value']
+        if not (text := mat.group(group)) or text in analyser.param_ids:
+            break
+        if (validator := arg['validator']) and (value.__class__ is UnionArg or validator.__class__ in _wrapped):
+            flag, res = validator(text, None)
+            if flag != "valid":
+                break
+        elif value.model == PatternModel.KEEP:
+            res = text
+        else:
+            if inner < 0:
+                if not (found := value.regex_pattern.findall(text)):  # type: ignore
+                    break
+                res = found[0][0] if isinstance(found[0], tuple) else found[0]
+            else:
+                res = mat.group(inner)
+            if value.model == PatternModel.REGEX_CONVERT:  # type: ignore
+                try:
+                    res = value.converter(res)  # type: ignore
+                except Exception:
+                    break
+        if value.validators and validator.__class__ not in _wrapped and not all(i(res) for i in value.validators):
+            break
+        if key[0] != '$':
+            result[key] = res
+    else:
+        analyser.context = pattern.units[-1][1]
+        return result
+    tokens.index = index
+
+
+class Failure:
+    """
+    解析失败的结果, 代替在解析过程中抛出 ParamsUnmatched 或 ArgumentMissing
+
+    错误信息仅在失败需要报告给用户时才会格式化; template 可以是语言文件中的键
+    """
+    __slots__ = ("error", "template", "params")
+
+    def __init__(self, error: Union[Type[Exception], Exception], template: str = "", **params: Any):
+        self.error = error
+        self.template = template
+        self.params = params
+
+    @property
+    def error_type(self) -> Type[Exception]:
+        return self.error if isinstance(self.error, type) else self.error.__class__
+
+    def exception(self) -> Exception:
+        """构造对应的异常"""
+        if isinstance(self.error, Exception):
+            return self.error
+        return self.error(config.lang.require(self.template).format(**self.params))
+
+    def __repr__(self):
+        return repr(self.exception())
+
+
+def _vector_texts(
+    analyser: 'Analyser', seps: Set[str], count: int
+) -> Tuple[List[str], Optional[List[Tuple[int, int]]], bool]:
+    """
+    取出批量转换的可变参数可能使用的文本, 直到遇到选项或非文本的单元
+
+    Returns:
+        文本列表; 各文本之前的游标位置, 单元未被切分时为 None, 此时第 i 个文本即游标后的第 i 个单元;
+        是否因遇到选项而停止
+    """
+    if analyser.separators.issuperset(seps) and (raw := analyser.tokens.texts(count)) is not None and "" not in raw:
+        if analyser.param_ids.isdisjoint(raw):
+            return raw, None, False
+        return raw[:next(i for i, text in enumerate(raw) if text in analyser.param_ids)], None, True
+    raw, spans = [], []
+    for _ in range(count):
+        spans.append((analyser.current_index, analyser.content_index))
+        _m_arg, _m_str = analyser.popitem(seps)
+        if not _m_arg:
+            spans.pop()
+            continue
+        if not _m_str or _m_arg in analyser.param_ids:
+            return raw, spans, _m_str
+        raw.append(_m_arg)
+    spans.append((analyser.current_index, analyser.content_index))
+    return raw, spans, False
+
 
 def multi_arg_handler(
     analyser: 'Analyser',
@@ -33,38 +242,54 @@ def multi_arg_handler(
     elif value.flag == 'kwargs' and args.var_positional:
         nargs -= 1
     _m_rest_arg = nargs - len(result_dict) - 1
-    _m_all_args_count = len(analyser.release(seps)) - _m_rest_arg + 1
+    analyser.pushback(may_arg)
+    _m_all_args_count = analyser.remaining(seps) - _m_rest_arg
     if value.array_length:
         _m_all_args_count = min(_m_all_args_count, value.array_length)
-    analyser.pushback(may_arg)
-    if value.flag == 'args':
+    # 最近 q - 1 个结果的起始位置; 遇到选项时将其让给之后的参数
+    marks: Deque[Tuple[int, int]] = deque(maxlen=max(_m_rest_arg, 0))
+
+    def __putback(data):
+        analyser.pushback(data)
+        if marks:
+            analyser.current_index, analyser.content_index = marks[0]
+            for _ in range(len(marks)):
+                result.popitem() if isinstance(result, dict) else result.pop()  # type: ignore
+
+    if value.flag == 'args' and value.vectorized:
+        # 整段文本以一次正则匹配校验, 再一次性转换; 非文本的单元结束该可变参数
+        raw, spans, give_back = _vector_texts(analyser, seps, _m_all_args_count)
+        if (end := value.valid_prefix(raw)) < len(raw):
+            give_back = bool(_kwarg_key.match(raw[end]))
+        if give_back:
+            end -= min(max(_m_rest_arg, 0), end)
+        if spans is None:
+            analyser.tokens.skip(end)
+        else:
+            analyser.current_index, analyser.content_index = spans[end]
+        result_dict[key] = value.batch(raw[:end]) if end else ((default,) if default else ())
+    elif value.flag == 'args':
         result = []
         for i in range(_m_all_args_count):
+            mark = analyser.current_index, analyser.content_index
             _m_arg, _m_str = analyser.popitem(seps)
             if not _m_arg:
                 continue
-            if _m_str and (_m_arg in analyser.param_ids or re.match(r'^([^=]+)=\s?$', _m_arg)):
-                analyser.pushback(_m_arg)
-                for ii in range(min(len(result), _m_rest_arg)):
-                    analyser.pushback(result.pop(-1))
+            if _m_str and (_m_arg in analyser.param_ids or _kwarg_key.match(_m_arg)):
+                __putback(_m_arg)
                 break
             if (res := value.validate(_m_arg)).flag != 'valid':
                 analyser.pushback(_m_arg)
                 break
             result.append(res.value)
+            marks.append(mark)
         if len(result) == 0:
             result = [default] if default else []
         result_dict[key] = tuple(result)
     else:
         result = {}
-
-        def __putback(data):
-            analyser.pushback(data)
-            for _ in range(min(len(result), _m_rest_arg)):
-                arg = result.popitem()  # type: ignore
-                analyser.pushback(f'{arg[0]}={arg[1]}')
-
         for i in range(_m_all_args_count):
+            mark = analyser.current_index, analyser.content_index
             _m_arg, _m_str = analyser.popitem(seps)
             if not _m_arg:
                 continue
@@ -74,13 +299,13 @@ def multi_arg_handler(
             if _m_str and _m_arg in analyser.command_params:
                 __putback(_m_arg)
                 break
-            if _kwarg := re.match(r'^([^=]+)=([^=]+?)$', _m_arg):
+            if _kwarg := _kwarg_pair.match(_m_arg):
                 _m_arg = _kwarg.group(2)
                 if (res := value.validate(_m_arg)).flag != 'valid':
                     analyser.pushback(_m_arg)
                     break
                 result[_kwarg.group(1)] = res.value
-            elif _kwarg := re.match(r'^([^=]+)=\s?$', _m_arg):
+            elif _kwarg := _kwarg_key.match(_m_arg):
                 _m_arg, _m_str = analyser.popitem(seps)
                 if (res := value.validate(_m_arg)).flag != 'valid':
                     __putback(_m_arg)
@@ -89,12 +314,13 @@ def multi_arg_handler(
             else:
                 analyser.pushback(_m_arg)
                 break
+            marks.append(mark)
         if len(result) == 0:
             result = [default] if default else []
         result_dict[key] = result
 
 
-def analyse_args(analyser: 'Analyser', args: Args) -> Dict[str, Any]:
+def analyse_args(analyser: 'Analyser', args: Args) -> Union[Dict[str, Any], Failure]:
     """
     分析 Args 部分
 
@@ -103,8 +329,10 @@ def analyse_args(analyser: 'Analyser', args: Args) -> Dict[str, Any]:
         args: 目标Args
 
     Returns:
-        Dict: 解析结果
+        Dict: 解析结果, 失败时为 Failure
     """
+    if (pattern := analyser.args_patterns.get(id(args))) and (res := analyse_args_pattern(analyser, pattern)):
+        return res
     result: Dict[str, Any] = {}
     seps = args.separators
     for key, arg in args.argument.items():
@@ -120,18 +348,18 @@ def analyse_args(analyser: 'Analyser', args: Args) -> Dict[str, Any]:
             if default_val is None:
                 if optional:
                     continue
-                raise ArgumentMissing(config.lang.args_missing.format(key=key))
+                return Failure(ArgumentMissing, "args.missing", key=key)
             result[key] = None if default_val is Empty else default_val
             continue
         if arg['kwonly']:
-            _kwarg = re.findall(f'^{key}=(.*)$', may_arg)
+            _kwarg = (analyser.kwonly_patterns.get(key) or kwonly_pattern(key)).findall(may_arg)
             if not _kwarg:
                 analyser.pushback(may_arg)
                 if analyser.fuzzy_match and (k := may_arg.split('=')[0]) != may_arg:
                     if levenshtein_norm(k, key) >= config.fuzzy_threshold:
                         raise FuzzyMatchSuccess(config.lang.common_fuzzy_matched.format(source=k, target=key))
                 if default_val is None and analyser.raise_exception:
-                    raise ParamsUnmatched(config.lang.args_key_missing.format(target=may_arg, key=key))
+                    return Failure(ParamsUnmatched, "args.key_missing", target=may_arg, key=key)
                 result[key] = None if default_val is Empty else default_val
                 continue
             may_arg = _kwarg[0]
@@ -140,22 +368,25 @@ def analyse_args(analyser: 'Analyser', args: Args) -> Dict[str, Any]:
                 if _str:
                     analyser.pushback(may_arg)
                     if default_val is None and analyser.raise_exception:
-                        raise ParamsUnmatched(config.lang.args_type_error.format(target=may_arg.__class__))
+                        return Failure(ParamsUnmatched, "args.type_error", target=may_arg.__class__)
                     result[key] = None if default_val is Empty else default_val
                     continue
         if isinstance(value, BasePattern):
             if value.__class__ is MultiArg:
                 multi_arg_handler(analyser, args, may_arg, key, value, default_val, result)  # type: ignore
             else:
-                res = value(may_arg, default_val)
-                if res.flag != 'valid':
+                if validator := arg['validator']:
+                    flag, res = validator(may_arg, default_val)
+                else:
+                    flag, res = (_res := value(may_arg, default_val)).flag, _res.value
+                if flag != 'valid':
                     analyser.pushback(may_arg)
-                if res.flag == 'error':
+                if flag == 'error':
                     if optional:
                         continue
-                    raise ParamsUnmatched(*res.error.args)
+                    return Failure(ParamsUnmatched(*res.args))
                 if key[0] != '$':
-                    result[key] = res.value
+                    result[key] = res
         elif value is AllParam:
             analyser.pushback(may_arg)
             result[key] = analyser.release()
@@ -167,7 +398,7 @@ def analyse_args(analyser: 'Analyser', args: Args) -> Dict[str, Any]:
         elif default_val is None:
             if optional:
                 continue
-            raise ParamsUnmatched(config.lang.args_error.format(target=may_arg))
+            return Failure(ParamsUnmatched, "args.error", target=may_arg)
         else:
             result[key] = None if default_val is Empty else default_val
     if args.var_keyword:
@@ -179,7 +410,7 @@ def analyse_args(analyser: 'Analyser', args: Args) -> Dict[str, Any]:
         varargs = result[args.var_positional]
         if not isinstance(varargs, Iterable):
             varargs = [varargs]
-        elif not isinstance(varargs, list):
+        elif not isinstance(varargs, list) and not getattr(args.argument[args.var_positional]['value'], 'vectorized', False):
             varargs = list(varargs)
         result['__varargs__'] = (varargs, args.var_positional)
     if args.keyword_only:
@@ -211,60 +442,78 @@ def analyse_unmatch_params(
                 raise FuzzyMatchSuccess(config.lang.common_fuzzy_matched.format(source=_may_param, target=_p.name))
 
 
-def analyse_option(analyser: 'Analyser', param: Option) -> Tuple[str, OptionResult]:
+def analyse_option(analyser: 'Analyser', param: Option) -> Union[Tuple[str, OptionResult], Failure]:
     """
     分析 Option 部分
 
     Args:
         analyser: 使用的分析器
         param: 目标Option
+
+    Returns:
+        Tuple[str, OptionResult]: 选项的名称与结果, 失败时为 Failure
     """
     analyser.context = param
     if param.requires and analyser.sentences != param.requires:
-        raise ParamsUnmatched(f"{param.name}'s required is not '{' '.join(analyser.sentences)}'")
+        return Failure(
+            ParamsUnmatched, "{name}'s required is not '{target}'", name=param.name, target=' '.join(analyser.sentences)
+        )
     analyser.sentences = []
     if param.is_compact:
         name, _ = analyser.popitem()
-        for al in param.aliases:
-            if mat := re.fullmatch(f"{al}(?P<rest>.*?)", name):
+        for pattern in analyser.compact_patterns.get(param) or compact_patterns(param):
+            if mat := pattern.fullmatch(name):
                 analyser.pushback(mat.groupdict()['rest'], replace=True)
                 break
         else:
-            raise ParamsUnmatched(f"{name} dose not matched with {param.name}")
+            return Failure(ParamsUnmatched, "{target} dose not matched with {name}", target=name, name=param.name)
     else:
         name, _ = analyser.popitem(param.separators)
         if name not in param.aliases:  # 先匹配选项名称
-            raise ParamsUnmatched(f"{name} dose not matched with {param.name}")
+            return Failure(ParamsUnmatched, "{target} dose not matched with {name}", target=name, name=param.name)
     name = param.dest
     res: OptionResult = {"value": None, "args": {}}
     if param.nargs == 0:
         res['value'] = Ellipsis
+    elif isinstance(args := analyse_args(analyser, param.args), Failure):
+        return args
     else:
-        res['args'] = analyse_args(analyser, param.args)
+        res['args'] = args
     return name, res
 
 
-def analyse_subcommand(analyser: 'Analyser', param: Subcommand) -> Tuple[str, SubcommandResult]:
-    """
-    分析 Subcommand 部分
-
-    Args:
-        analyser: 使用的分析器
-        param: 目标Subcommand
-    """
+def match_subcommand(analyser: 'Analyser', param: Subcommand) -> Optional[Failure]:
+    """匹配子命令的前置句子与名称, 失败时返回 Failure"""
     analyser.context = param
     if param.requires and analyser.sentences != param.requires:
-        raise ParamsUnmatched(f"{param.name}'s required is not '{' '.join(analyser.sentences)}'")
+        return Failure(
+            ParamsUnmatched, "{name}'s required is not '{target}'", name=param.name, target=' '.join(analyser.sentences)
+        )
     analyser.sentences = []
     if param.is_compact:
         name, _ = analyser.popitem()
         if not name.startswith(param.name):
-            raise ParamsUnmatched(f"{name} dose not matched with {param.name}")
+            return Failure(ParamsUnmatched, "{target} dose not matched with {name}", target=name, name=param.name)
         analyser.pushback(name.lstrip(param.name), replace=True)
     else:
         name, _ = analyser.popitem(param.separators)
         if name != param.name:  # 先匹配选项名称
-            raise ParamsUnmatched(f"{name} dose not matched with {param.name}")
+            return Failure(ParamsUnmatched, "{target} dose not matched with {name}", target=name, name=param.name)
+
+
+def analyse_subcommand(analyser: 'Analyser', param: Subcommand) -> Union[Tuple[str, SubcommandResult], Failure]:
+    """
+    分析 Subcommand 部分
+
+    Args:
+        analyser: 使用的分析器
+        param: 目标Subcommand
+
+    Returns:
+        Tuple[str, SubcommandResult]: 子命令的名称与结果, 失败时为 Failure
+    """
+    if fail := match_subcommand(analyser, param):
+        return fail
     name = param.dest
     res: SubcommandResult = {"value": None, "args": {}, 'options': {}}
     if param.sub_part_len.stop == 0:
@@ -280,36 +529,26 @@ def analyse_subcommand(analyser: 'Analyser', param: Subcommand) -> Tuple[str, Su
             analyse_unmatch_params(param.sub_params.values(), _text, analyser.fuzzy_match)
         )
         if (not _param or _param is Ellipsis) and not args:
-            res['args'] = analyse_args(analyser, param.args)
+            if isinstance(_args := analyse_args(analyser, param.args), Failure):
+                return _args
+            res['args'] = _args
             args = True
-        elif isinstance(_param, List):
-            for p in _param:
-                _current_index = analyser.current_index
-                _content_index = analyser.content_index
-                try:
-                    res['options'].setdefault(*analyse_option(analyser, p))
-                    break
-                except Exception as e:
-                    exc = e
-                    analyser.current_index = _current_index
-                    analyser.content_index = _content_index
-                    continue
-            else:
-                raise exc  # type: ignore  # noqa
+        elif isinstance(_param, List) and (fail := analyser.analyse_options(_param, res['options'])):
+            return fail  # type: ignore
 
     if not args and param.nargs > 0:
-        raise ArgumentMissing(config.lang.subcommand_args_missing.format(name=name))
+        return Failure(ArgumentMissing, "subcommand.args_missing", name=name)
     return name, res
 
 
-def analyse_header(analyser: 'Analyser') -> Union[Dict[str, Any], bool, None]:
+def analyse_header(analyser: 'Analyser') -> Union[Dict[str, Any], bool, None, Failure]:
     """
     分析命令头部
 
     Args:
         analyser: 使用的分析器
     Returns:
-        head_match: 当命令头内写有正则表达式并且匹配成功的话, 返回匹配结果
+        head_match: 当命令头内写有正则表达式并且匹配成功的话, 返回匹配结果; 不匹配时为 Failure
     """
     command = analyser.command_header
     head_text, _str = analyser.popitem()
@@ -342,7 +581,9 @@ def analyse_header(analyser: 'Analyser') -> Union[Dict[str, Any], bool, None]:
                     return _command_find or True
             elif _str and isinstance(command[0], tuple) and isinstance(command[0][1], TPattern):
                 if _m_str:
-                    pat = re.compile(command[0][1].pattern + command[1].pattern)  # type: ignore
+                    pat = analyser.mixin_header or re.compile(
+                        command[0][1].pattern + command[1].pattern  # type: ignore
+                    )
                     if _head_find := pat.fullmatch(head_text):
                         analyser.pushback(may_command)
                         analyser.head_matched = True
@@ -373,9 +614,9 @@ def analyse_header(analyser: 'Analyser') -> Union[Dict[str, Any], bool, None]:
                 source = head_text + analyser.separators.copy().pop() + str(may_command)  # type: ignore  # noqa
             if source == analyser.alconna.command:
                 analyser.head_matched = False
-                raise ParamsUnmatched(config.lang.header_error.format(target=head_text))
+                return Failure(ParamsUnmatched, "header.error", target=head_text)
             for ht in headers_text:
                 if levenshtein_norm(source, ht) >= config.fuzzy_threshold:
                     analyser.head_matched = True
                     raise FuzzyMatchSuccess(config.lang.common_fuzzy_matched.format(target=source, source=ht))
-        raise ParamsUnmatched(config.lang.header_error.format(target=head_text))
+        return Failure(ParamsUnmatched, "header.error", target=head_text)
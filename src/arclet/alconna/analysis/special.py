@@ -6,7 +6,7 @@ from ..args import ArgUnit
 from ..builtin import ShortcutOption
 from ..config import config
 from ..exceptions import ParamsUnmatched
-from .parts import analyse_option
+from .parts import analyse_option, Failure
 
 if TYPE_CHECKING:
     from .analyser import Analyser
@@ -27,7 +27,9 @@ def handle_help(analyser: "Analyser"):
 
 
 def handle_shortcut(analyser: "Analyser"):
-    opt_v = analyse_option(analyser, ShortcutOption)[1]["args"]
+    if isinstance(res := analyse_option(analyser, ShortcutOption), Failure):
+        raise res.exception()
+    opt_v = res[1]["args"]
     try:
         msg = analyser.alconna.shortcut(
             opt_v["name"],
@@ -0,0 +1,102 @@
+"""依据命令的结构为分析器选择最简的解析流程"""
+from typing import Any, Optional, Callable
+from nepattern.util import TPattern
+
+from ..exceptions import ParamsUnmatched, ArgumentMissing, CompletionTriggered
+from ..manager import command_manager
+from .analyser import Analyser
+from .parts import analyse_args, analyse_header, Failure
+from .special import handle_completion
+
+
+def _ready(analyser: Analyser, interrupt: bool) -> bool:
+    """只有未解析过的新消息才走简化流程, 其余情况交由通用的 analyse"""
+    tokens = analyser.tokens
+    return not (
+        interrupt or analyser.temporary_data or not tokens.size or tokens.index or tokens.offset or
+        (analyser.message_cache and analyser.temp_token in analyser.used_tokens) or
+        command_manager.is_disable(analyser.alconna)
+    )
+
+
+def _header(analyser: Analyser) -> Any:
+    """与 parts.analyse_header 一致, 但纯文本命令头直接以正则匹配"""
+    command = analyser.command_header
+    if isinstance(command, TPattern):
+        head, is_str = analyser.tokens.pop()
+        if is_str and (mat := command.fullmatch(head)):
+            analyser.head_matched = True
+            return mat.groupdict() or True
+        return Failure(ParamsUnmatched, "header.error", target=head)
+    return analyse_header(analyser)
+
+
+def analyse_header_only(self: Analyser, message=None, interrupt: bool = False):
+    """只有命令头的命令"""
+    if not _ready(self, interrupt):
+        return Analyser.analyse(self, message, interrupt)
+    tokens = self.tokens
+    if (header := _header(self)).__class__ is Failure:
+        return self.header_mismatch(header)
+    self.header = header
+    self.head_pos = tokens.index, tokens.offset
+    if tokens.index < tokens.size:
+        text, is_str = tokens.pop(None, False)
+        if is_str and text and (options := self.command_params.get(text)).__class__ is list:
+            return self.analyse_options(options)  # type: ignore
+        return self.params_incomplete()
+    return self.export()
+
+
+def analyse_main_args(self: Analyser, message=None, interrupt: bool = False):
+    """只有命令头与主参数的命令"""
+    if not _ready(self, interrupt):
+        return Analyser.analyse(self, message, interrupt)
+    tokens = self.tokens
+    if (header := _header(self)).__class__ is Failure:
+        return self.header_mismatch(header)
+    self.header = header
+    self.head_pos = tokens.index, tokens.offset
+    for _ in self.part_len:
+        text, is_str = tokens.pop(None, False)
+        if is_str and text and (options := self.command_params.get(text)).__class__ is list:
+            return self.analyse_options(options)  # type: ignore
+        if self.main_args:
+            break
+        try:
+            main_args = analyse_args(self, self.self_args)
+        except CompletionTriggered as comp:
+            return handle_completion(self, comp.args[0])
+        except (ParamsUnmatched, ArgumentMissing) as e:
+            main_args = Failure(e)
+        if main_args.__class__ is Failure:
+            return self.param_mismatch(main_args)  # type: ignore
+        self.main_args = main_args  # type: ignore
+        if tokens.index == tokens.size:
+            break
+    if self.default_main_only and not self.main_args:
+        if (main_args := analyse_args(self, self.self_args)).__class__ is Failure:
+            raise main_args.exception()  # type: ignore
+        self.main_args = main_args  # type: ignore
+    if tokens.index == tokens.size and (not self.need_main_args or self.main_args):
+        return self.export()
+    return self.params_incomplete()
+
+
+def select(analyser: Analyser) -> Optional[Callable[..., Any]]:
+    """
+    依据命令的结构选择最简的 analyse 函数
+
+    命令没有内置选项以外的选项与子命令时, 解析只需匹配命令头与主参数; 内置选项、解析失败与快捷指令
+    由 Analyser 上与通用流程共用的方法处理, 因此结果与通用流程一致
+
+    Returns:
+        Optional[Callable]: 选中的函数; 命令需要通用的分析器时返回 None
+    """
+    if analyser.fuzzy_match or not analyser.default_separate:
+        return
+    if (cls := analyser.__class__).analyse is not Analyser.analyse or cls.analyse_param is not Analyser.analyse_param:
+        return
+    if any(opt.name not in analyser._special for opt in analyser.alconna.options):
+        return
+    return analyse_main_args if analyser.self_args.argument else analyse_header_only
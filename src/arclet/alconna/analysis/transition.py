@@ -0,0 +1,138 @@
+"""以状态转移表驱动的分析器"""
+from enum import IntEnum
+from typing import Dict, Tuple, Any, Union, Optional, List, Iterable
+
+from ..base import Option, Subcommand, Sentence, SubcommandResult
+from ..arpamar import Arpamar
+from ..exceptions import ArgumentMissing, CompletionTriggered
+from .analyser import Analyser
+from .parts import analyse_args, analyse_option, analyse_unmatch_params, match_subcommand, Failure
+
+
+class Transition(IntEnum):
+    """状态转移时执行的动作"""
+    OPTION = 0
+    """唯一匹配的选项, 直接解析"""
+    OPTIONS = 1
+    """共用别名的多个选项, 依优先级逐个尝试; 只有这种有歧义的文法需要回溯"""
+    SUBCOMMAND = 2
+    """进入子命令的状态"""
+    SENTENCE = 3
+    """选项或子命令要求的前置句子"""
+    SPECIAL = 4
+    """内置的特殊选项, 如 --help"""
+    COMPLETION = 5
+    """子命令中的补全请求"""
+    IGNORE = 6
+    """不做任何处理, 如子命令中的句子"""
+
+
+TTable = Dict[str, Tuple[Transition, Any]]
+
+
+class TransitionAnalyser(Analyser):
+    """
+    在编译时将 command_params 与 Subcommand.sub_params 转换为状态转移表的分析器
+
+    每个状态 (命令本身或某个子命令) 对应一张 "单元文本 -> 动作" 的表, 不在表中的单元视为参数;
+    每次转移只做一次选项或子命令的匹配, 失败即报告, 不保存与恢复位置; 仅共用别名的选项需要逐个尝试
+
+    Examples:
+        >>> Alconna.config(analyser_type=TransitionAnalyser)
+    """
+    transitions: Dict[Optional[str], TTable]
+    """以子命令的 dest 为键的状态转移表, None 对应命令本身"""
+
+    def __post_compile__(self):
+        """为命令本身与其每个子命令构建状态转移表"""
+        self.transitions = {None: {key: self._transition(param) for key, param in self.command_params.items()}}
+        for param in self.command_params.values():
+            if isinstance(param, Subcommand):
+                table = {key: self._transition(sub, param) for key, sub in param.sub_params.items()}
+                table["--comp"] = table["-cp"] = (Transition.COMPLETION, param)
+                self.transitions[param.dest] = table
+
+    def _transition(
+        self, param: Union[List[Option], Subcommand, Sentence], state: Optional[Subcommand] = None
+    ) -> Tuple[Transition, Any]:
+        if isinstance(param, list):
+            if len(param) > 1:
+                return Transition.OPTIONS, param
+            if state is None and (handler := self._special.get(param[0].name)):
+                return Transition.SPECIAL, handler
+            return Transition.OPTION, param[0]
+        if isinstance(param, Subcommand):
+            return Transition.SUBCOMMAND, param
+        # 与 parts.analyse_subcommand 一致, 子命令内的句子不被处理
+        return (Transition.SENTENCE, param) if state is None else (Transition.IGNORE, param)
+
+    def _next(
+        self, table: TTable, params: Iterable[Any], text: Union[str, Any], is_str: bool, unmatch: bool,
+        state: Optional[Subcommand] = None
+    ) -> Optional[Tuple[Transition, Any]]:
+        """查表得到下一个单元对应的动作, 为 None 时该单元视为参数"""
+        if is_str and text:
+            if trans := table.get(text):
+                return trans
+            if unmatch and (_param := analyse_unmatch_params(params, text, self.fuzzy_match)):
+                return self._transition(_param, state)
+
+    def analyse_param(self, text: Union[str, Any], is_str: bool) -> Union[Arpamar, Failure, None]:
+        trans = self._next(
+            self.transitions[None], self.command_params.values(), text, is_str, not self.default_separate
+        )
+        if trans is None:
+            if not self.main_args:
+                if isinstance(main_args := analyse_args(self, self.self_args), Failure):
+                    return main_args
+                self.main_args = main_args
+            return
+        kind, target = trans
+        if kind == Transition.OPTION:
+            if isinstance(res := analyse_option(self, target), Failure):
+                return res
+            self.options[res[0]] = res[1]
+        elif kind == Transition.OPTIONS:
+            return self.analyse_options(target)
+        elif kind == Transition.SPECIAL:
+            return target(self)
+        elif kind == Transition.SUBCOMMAND:
+            if isinstance(res := self.analyse_subcommand(target), Failure):
+                return res
+            self.subcommands.setdefault(*res)
+        elif kind == Transition.SENTENCE:
+            self.sentences.append(self.popitem()[0])
+
+    def analyse_subcommand(self, param: Subcommand) -> Union[Tuple[str, SubcommandResult], Failure]:
+        """与 parts.analyse_subcommand 一致, 但子命令内的每个单元由该子命令的状态转移表决定"""
+        if fail := match_subcommand(self, param):
+            return fail
+        res: SubcommandResult = {"value": None, "args": {}, 'options': {}}
+        if param.sub_part_len.stop == 0:
+            res['value'] = Ellipsis
+            return param.dest, res
+
+        table = self.transitions[param.dest]
+        args = False
+        for _ in param.sub_part_len:
+            text, is_str = self.popitem(param.separators, move=False)
+            if (trans := self._next(table, param.sub_params.values(), text, is_str, True, param)) is None:
+                if not args:
+                    if isinstance(_args := analyse_args(self, param.args), Failure):
+                        return _args
+                    res['args'] = _args
+                    args = True
+                continue
+            kind, target = trans
+            if kind == Transition.COMPLETION:
+                raise CompletionTriggered(target)
+            if kind == Transition.OPTION:
+                if isinstance(_res := analyse_option(self, target), Failure):
+                    return _res
+                res['options'].setdefault(*_res)
+            elif kind == Transition.OPTIONS and (fail := self.analyse_options(target, res['options'])):
+                return fail  # type: ignore
+
+        if not args and param.nargs > 0:
+            return Failure(ArgumentMissing, "subcommand.args_missing", name=param.dest)
+        return param.dest, res
@@ -6,9 +6,14 @@ from enum import Enum
 from contextlib import suppress
 from typing import Union, Tuple, Dict, Iterable, Callable, Any, Optional, Sequence, List, Literal, TypedDict, Set
 from dataclasses import dataclass, field
-from nepattern import BasePattern, Empty, AllParam, AnyOne, UnionArg, type_parser, pattern_map
+from nepattern import (
+    BasePattern, Empty, AllParam, AnyOne, UnionArg, PatternModel, type_parser, pattern_map, generic_isinstance
+)
+from nepattern.config import lang as pattern_lang
+from nepattern.exception import MatchFailed
 
 from .config import config
+from .util import LruCache, is_async
 from .exceptions import InvalidParam, NullMessage
 from .typing import MultiArg
 
@@ -24,6 +29,8 @@ class ArgFlag(str, Enum):
     HIDDEN = "H"
     FORCE = "F"
     ANTI = "A"
+    VECTORIZED = "V"
+    CASEFOLD = "C"
 
 
 @dataclass
@@ -33,6 +40,8 @@ class ArgField:
     default_factory: Callable[[], Any] = field(default=lambda: None)
     alias: Optional[str] = field(default=None)
     completion: Optional[Callable[[], Union[str, List[str]]]] = field(default=None)
+    cache_size: int = field(default=0)
+    lazy: bool = field(default=False)
 
     @property
     def display(self):
@@ -43,6 +52,318 @@ class ArgField:
         return self.default if self.default is not None else self.default_factory()
 
 
+def _builtin_validators() -> Dict[int, Callable[[Any, Any], Tuple[str, Any]]]:
+    """
+    为内置的 str, int, float, bool 与 AnyOne 构造快速校验函数
+
+    校验函数返回 (flag, value), 只以字符串方法判断常见的输入; 无法直接判断时交由原本的 BasePattern 处理, 结果与其一致
+    """
+    _str, _int, _float, _bool = pattern_map[str], pattern_map[int], pattern_map[float], pattern_map[bool]
+
+    def _generic(pattern: BasePattern, arg: Any, default: Any) -> Tuple[str, Any]:
+        res = pattern(arg, default)
+        return res.flag, res.value
+
+    def check_any(arg: Any, default: Any) -> Tuple[str, Any]:
+        return "valid", arg
+
+    def check_str(arg: Any, default: Any) -> Tuple[str, Any]:
+        if isinstance(arg, str):
+            return "valid", arg
+        return _generic(_str, arg, default)
+
+    def check_int(arg: Any, default: Any) -> Tuple[str, Any]:
+        if arg.__class__ is str:
+            if arg.isdecimal() or (arg[:1] == "-" and arg[1:].isdecimal()):
+                return "valid", int(arg)
+        elif arg.__class__ is int:
+            return "valid", arg
+        return _generic(_int, arg, default)
+
+    def check_float(arg: Any, default: Any) -> Tuple[str, Any]:
+        if arg.__class__ is str:
+            head, _, tail = (arg[1:] if arg[:1] == "-" else arg).partition(".")
+            if head.isdecimal() and (not tail or tail.isdecimal()):
+                return "valid", float(arg)
+        elif arg.__class__ is float:
+            return "valid", arg
+        return _generic(_float, arg, default)
+
+    def check_bool(arg: Any, default: Any) -> Tuple[str, Any]:
+        if arg.__class__ is str:
+            if (text := arg.lower()) == "true":
+                return "valid", True
+            if text == "false":
+                return "valid", False
+        elif arg.__class__ is bool:
+            return "valid", arg
+        return _generic(_bool, arg, default)
+
+    return {
+        id(AnyOne): check_any, id(_str): check_str, id(_int): check_int, id(_float): check_float, id(_bool): check_bool
+    }
+
+
+_validators = _builtin_validators()
+
+
+def _literal_choices(pattern: Any) -> Optional[List[Any]]:
+    """UnionArg 的成员均为常量 (或不含正则元字符的字符串模式) 时返回全部常量"""
+    if not isinstance(pattern, UnionArg) or pattern.anti or pattern.validators:
+        return
+    choices = list(pattern.for_equal)
+    for pat in pattern.for_validate:
+        if (
+            pat.__class__ is not BasePattern or pat.model != PatternModel.REGEX_MATCH or pat.origin is not str or
+            pat.previous or pat.accepts or pat.validators or pat.anti or re.escape(pat.pattern) != pat.pattern
+        ):
+            return
+        choices.append(pat.pattern)
+    try:
+        frozenset(choices)
+    except TypeError:
+        return
+    return choices
+
+
+def choice_validator(pattern: Any, casefold: bool = False) -> Optional[Callable[[Any, Any], Tuple[str, Any]]]:
+    """
+    为纯常量的多选参数构造以集合查找的校验函数, 校验耗时与可选值的数量无关
+
+    Args:
+        pattern: 参数的 UnionArg, 如 "a|b|c" 或 Literal["a", "b", "c"]
+        casefold: 是否忽略字符串的大小写; 匹配成功时返回声明中的原值
+    Returns:
+        Optional[Callable]: 校验函数; 参数并非纯常量的选择时返回 None
+    """
+    if (choices := _literal_choices(pattern)) is None:
+        return
+    equal = frozenset(choices)
+    folded = {c.casefold(): c for c in reversed(choices) if isinstance(c, str)} if casefold else {}
+
+    def check_choice(arg: Any, default: Any) -> Tuple[str, Any]:
+        if arg.__class__ is str and arg and arg[-1] != "\n":
+            if arg in equal:
+                return "valid", arg
+            if folded and (res := folded.get(arg.casefold())) is not None:
+                return "valid", res
+            if default is None:
+                return "error", MatchFailed(pattern_lang.content_error.format(target=arg))
+            return "default", None if default is Empty else default
+        res = pattern(arg, default)
+        return res.flag, res.value
+
+    return check_choice
+
+
+_IMMUTABLE = (str, bytes, int, float, complex, bool, type(None), range, frozenset, Enum)
+
+
+def _immutable(value: Any) -> bool:
+    if isinstance(value, tuple):
+        return all(map(_immutable, value))
+    return isinstance(value, _IMMUTABLE)
+
+
+class ArgCache:
+    """
+    以原始输入为键缓存参数校验结果的校验函数, 由 ArgField(cache_size=...) 启用
+
+    只缓存与默认值无关的 (flag, value), 校验失败时再依据默认值决定结果; 不可哈希的输入不经过缓存
+
+    缓存的值会被之后的每次解析共享, 因此只缓存不可变的转换结果; 可变的结果 (如 list、dict) 与校验失败的结果不会被缓存
+
+    misses 为实际调用转换的次数, hits 为命中缓存的次数; 解析回退重试时同一输入的命中也会计入 hits
+    """
+    __slots__ = ("pattern", "validator", "cache", "hits", "misses")
+
+    def __init__(
+        self, pattern: BasePattern, max_size: int, validator: Optional[Callable[[Any, Any], Tuple[str, Any]]] = None
+    ):
+        self.pattern = pattern
+        self.validator = validator
+        self.cache: LruCache[Tuple[type, Any], Tuple[str, Any]] = LruCache(max_size)
+        self.hits = 0
+        self.misses = 0
+
+    def _validate(self, arg: Any) -> Tuple[str, Any]:
+        self.misses += 1
+        if self.validator:
+            return self.validator(arg, None)
+        res = self.pattern(arg)
+        return res.flag, res.value
+
+    def __call__(self, arg: Any, default: Any) -> Tuple[str, Any]:
+        key = (arg.__class__, arg)
+        try:
+            res = self.cache.get(key)
+        except TypeError:
+            res = self._validate(arg)
+        else:
+            if res is None:
+                res = self._validate(arg)
+                if res[0] != "error" and _immutable(res[1]):
+                    self.cache.set(key, res)
+            else:
+                self.hits += 1
+        if res[0] == "error" and default is not None:
+            return "default", None if default is Empty else default
+        return res
+
+    def __repr__(self):
+        return f"ArgCache(hits={self.hits}, misses={self.misses}, size={self.cache.size()})"
+
+
+class LazyValue:
+    """
+    延迟转换的参数值, 首次访问时才调用完整的转换并保存结果
+
+    属性访问、比较与常见的运算均转发给转换后的值; 转换失败时在访问处抛出异常
+
+    转换函数为异步函数时, 值需要先经由 `await` 或 `Alconna.parse_async` 转换
+    """
+    __slots__ = ("raw", "awaitable", "_factory", "_value")
+
+    def __init__(self, raw: Any, factory: Callable[[], Any], awaitable: bool = False):
+        self.raw = raw
+        self.awaitable = awaitable
+        self._factory = factory
+        self._value = Empty
+
+    @property
+    def resolved(self) -> bool:
+        return self._factory is None
+
+    @property
+    def value(self) -> Any:
+        if self._factory is not None:
+            if self.awaitable:
+                raise RuntimeError(config.lang.args_async_pending.format(target=self.raw))
+            self._value = self._factory()
+            self._factory = None
+        return self._value
+
+    async def resolve(self) -> Any:
+        """等待异步的转换完成并返回转换后的值"""
+        if self._factory is not None and self.awaitable:
+            self._value = await self._factory()
+            self._factory = None
+        return self.value
+
+    def __await__(self):
+        return self.resolve().__await__()
+
+    def __getattr__(self, item):
+        return getattr(self.value, item)
+
+    def __repr__(self):
+        return repr(self._value) if self.resolved else f"LazyValue({self.raw!r})"
+
+    def __str__(self):
+        return str(self.value)
+
+    def __eq__(self, other):
+        return self.value == (other.value if isinstance(other, LazyValue) else other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __int__(self):
+        return int(self.value)
+
+    def __float__(self):
+        return float(self.value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __contains__(self, item):
+        return item in self.value
+
+    def __getitem__(self, item):
+        return self.value[item]
+
+
+def _forward(name: str):
+    def method(self: LazyValue, *args):
+        return getattr(self.value, name)(*(arg.value if isinstance(arg, LazyValue) else arg for arg in args))
+    method.__name__ = name
+    return method
+
+
+for _name in (
+    "lt", "le", "gt", "ge", "add", "sub", "mul", "truediv", "floordiv", "mod", "pow", "neg",
+    "radd", "rsub", "rmul", "rtruediv", "rfloordiv", "rmod", "rpow", "index", "call"
+):
+    setattr(LazyValue, f"__{_name}__", _forward(f"__{_name}__"))
+
+
+class ArgLazy:
+    """
+    只做结构检查的校验函数, 由 ArgField(lazy=True) 启用; 参数的转换函数为异步函数时总是启用
+
+    字符串输入通过参数的正则 (或 TYPE_CONVERT 参数的类型) 检查后即视为匹配, 结果为 LazyValue; 其余输入照常校验
+    """
+    __slots__ = ("pattern", "validator")
+
+    def __init__(self, pattern: BasePattern, validator: Optional[Callable[[Any, Any], Tuple[str, Any]]] = None):
+        self.pattern = pattern
+        self.validator = validator
+
+    @staticmethod
+    def deferrable(pattern: Any) -> bool:
+        """只有带转换的正向匹配才能延迟"""
+        return (
+            isinstance(pattern, BasePattern) and pattern.__class__ is not MultiArg and not pattern.anti and
+            pattern.model in (PatternModel.REGEX_CONVERT, PatternModel.TYPE_CONVERT)
+        )
+
+    def _validate(self, arg: Any, default: Any) -> Tuple[str, Any]:
+        if self.validator:
+            return self.validator(arg, default)
+        res = self.pattern(arg, default)
+        return res.flag, res.value
+
+    def _resolve(self, arg: Any) -> Any:
+        flag, res = self._validate(arg, None)
+        if flag == "error":
+            raise res
+        return res
+
+    async def _resolve_async(self, arg: str) -> Any:
+        """与 BasePattern.validate 一致, 但等待异步的转换函数"""
+        pat = self.pattern
+        if pat.model == PatternModel.REGEX_CONVERT:
+            res = pat.regex_pattern.findall(arg)[0]
+            res = await pat.converter(res[0] if isinstance(res, tuple) else res)
+        elif not generic_isinstance(res := await pat.converter(arg), pat.origin) or (not res and pat.origin == Any):
+            raise MatchFailed(pattern_lang.content_error.format(target=arg))
+        if not all(i(res) for i in pat.validators):
+            raise MatchFailed(pattern_lang.content_error.format(target=arg))
+        return res
+
+    def __call__(self, arg: Any, default: Any) -> Tuple[str, Any]:
+        pat = self.pattern
+        if arg.__class__ is str and arg and (
+            pat.regex_pattern.match(arg) if pat.model == PatternModel.REGEX_CONVERT else
+            not pat.accepts or str in pat.accepts
+        ):
+            if is_async(pat.converter):
+                return "valid", LazyValue(arg, partial(self._resolve_async, arg), awaitable=True)
+            return "valid", LazyValue(arg, partial(self._resolve, arg))
+        if is_async(pat.converter) and not (pat.origin not in (str, Any) and generic_isinstance(arg, pat.origin)):
+            if default is None:
+                return "error", MatchFailed(pattern_lang.content_error.format(target=arg))
+            return "default", None if default is Empty else default
+        return self._validate(arg, default)
+
+
 class ArgUnit(TypedDict):
     """参数单元 """
     value: TAValue
@@ -57,6 +378,8 @@ class ArgUnit(TypedDict):
     """是否键值对参数"""
     hidden: bool
     """是否隐藏类型参数"""
+    validator: Optional[Callable[[Any, Any], Tuple[str, Any]]]
+    """内置类型的快速校验函数"""
 
 
 class ArgsMeta(type):
@@ -202,8 +525,9 @@ class Args(metaclass=ArgsMeta):  # type: ignore
         for arg in (args or []):
             self.__check_var__(arg)
         self.argument.update({  # type: ignore
-            k: {"value": type_parser(v), "field": ArgField(), 'notice': None,
-                'optional': False, 'hidden': False, 'kwonly': False}
+            k: {"value": (_v := type_parser(v)), "field": ArgField(), 'notice': None,
+                'optional': False, 'hidden': False, 'kwonly': False,
+                'validator': _validators.get(id(_v)) or choice_validator(_v)}
             for k, v in kwargs.items()
         })
 
@@ -260,7 +584,7 @@ class Args(metaclass=ArgsMeta):  # type: ignore
             raise InvalidParam(config.lang.args_value_error.format(target=name))
         slot: ArgUnit = {
             'value': _value, 'field': default, 'notice': None,
-            'optional': False, 'hidden': False, 'kwonly': False
+            'optional': False, 'hidden': False, 'kwonly': False, 'validator': None
         }
         if res := re.match(r"^.+?#(?P<notice>[^;#]+)", name):
             slot['notice'] = res["notice"]
@@ -307,6 +631,22 @@ class Args(metaclass=ArgsMeta):  # type: ignore
                     if self.var_keyword or self.var_positional:
                         raise InvalidParam(config.lang.args_exclude_mutable_args)
                     slot['kwonly'] = True
+            if ArgFlag.VECTORIZED in flags:
+                if not isinstance(slot['value'], MultiArg) or not slot['value'].vectorizable:
+                    raise InvalidParam(config.lang.args_vectorize_error.format(target=name))
+                slot['value'].vectorized = True
+            if ArgFlag.CASEFOLD in flags:
+                if not (validator := choice_validator(slot['value'], casefold=True)):
+                    raise InvalidParam(config.lang.args_casefold_error.format(target=name))
+                slot['validator'] = validator
+        slot['validator'] = slot['validator'] or _validators.get(id(slot['value'])) or choice_validator(slot['value'])
+        if (
+            default.cache_size > 0 and isinstance(slot['value'], BasePattern)
+            and slot['value'].__class__ is not MultiArg
+        ):
+            slot['validator'] = ArgCache(slot['value'], default.cache_size, slot['validator'])
+        if ArgLazy.deferrable(slot['value']) and (default.lazy or is_async(slot['value'].converter)):
+            slot['validator'] = ArgLazy(slot['value'], slot['validator'])
         self.argument[name] = slot
 
     @staticmethod
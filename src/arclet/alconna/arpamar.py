@@ -1,11 +1,17 @@
-from typing import Union, Dict, List, Any, Optional, TYPE_CHECKING, Type, TypeVar, Tuple, overload, Generic
+import asyncio
+from typing import (
+    Union, Dict, List, Any, Optional, TYPE_CHECKING, Type, TypeVar, Tuple, overload, Generic, Callable, NamedTuple
+)
+from types import MappingProxyType
+from inspect import isawaitable, iscoroutinefunction
 from contextlib import suppress
 from nepattern import Empty
 from .typing import TDataCollection
+from .args import LazyValue
 from .config import config
 from .base import SubcommandResult, OptionResult
-from .exceptions import BehaveCancelled, OutBoundsBehave
-from .components.behavior import T_ABehavior, requirement_handler
+from .exceptions import BehaveCancelled, OutBoundsBehave, ParamsUnmatched
+from .components.behavior import T_ABehavior, requirement_handler, requirement_levels
 from .components.duplication import Duplication, generate_duplication
 
 if TYPE_CHECKING:
@@ -15,6 +21,32 @@ T = TypeVar('T')
 T_Duplication = TypeVar('T_Duplication', bound=Duplication)
 
 
+def _plain(value: Any) -> Any:
+    """解析结果中的 LazyValue 以转换后的值替换; 尚未等待的异步转换保留原始输入"""
+    if isinstance(value, LazyValue):
+        return value.raw if value.awaitable and not value.resolved else value.value
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return value.__class__(_plain(v) for v in value)
+    return value
+
+
+class ArpamarRecord(NamedTuple):
+    """Arpamar 的精简形式, 只保留解析结果, 可被 pickle 以在进程间传递"""
+    source: str
+    """命令的路径"""
+    matched: bool
+    head_matched: bool
+    header: Union[Dict[str, Any], bool, None]
+    main_args: Dict[str, Any]
+    options: Dict[str, Any]
+    subcommands: Dict[str, Any]
+    error_info: Optional[str]
+    """错误信息的文本"""
+    error_data: List[Any]
+
+
 class Arpamar(Generic[TDataCollection]):
     """
     亚帕玛尔(Arpamar), Alconna的珍藏宝书
@@ -25,8 +57,9 @@ class Arpamar(Generic[TDataCollection]):
         self.origin: TDataCollection = ''
         self.matched: bool = False
         self.head_matched: bool = False
-        self.error_data: List[Union[str, Any]] = []
-        self.error_info: Optional[Union[str, BaseException]] = None
+        self._error_data: List[Union[str, Any]] = []
+        self._error_info: Optional[Union[str, BaseException, Type[BaseException]]] = None
+        self._lazy_error: Optional[Tuple[Callable[[], Any], Callable[[], List[Union[str, Any]]]]] = None
         self.other_args: Dict[str, Any] = {}
         self.main_args: Dict[str, Any] = {}
 
@@ -57,6 +90,41 @@ class Arpamar(Generic[TDataCollection]):
             return val
         return sub['value']
 
+    def _resolve_error(self):
+        info, data = self._lazy_error  # type: ignore
+        self._lazy_error = None
+        self._error_info, self._error_data = info(), data()
+
+    @property
+    def error_info(self) -> Optional[Union[str, BaseException, Type[BaseException]]]:
+        """解析失败时的错误信息"""
+        if self._lazy_error:
+            self._resolve_error()
+        return self._error_info
+
+    @error_info.setter
+    def error_info(self, value: Optional[Union[str, BaseException, Type[BaseException]]]):
+        if self._lazy_error:
+            self._resolve_error()
+        self._error_info = value
+
+    @property
+    def error_data(self) -> List[Union[str, Any]]:
+        """解析失败时未被解析的消息单元"""
+        if self._lazy_error:
+            self._resolve_error()
+        return self._error_data
+
+    @error_data.setter
+    def error_data(self, value: List[Union[str, Any]]):
+        if self._lazy_error:
+            self._resolve_error()
+        self._error_data = value
+
+    def lazy_error(self, info: Callable[[], Any], data: Callable[[], List[Union[str, Any]]]):
+        """设置错误信息与错误数据的生成函数, 两者在首次读取时才会计算"""
+        self._lazy_error = (info, data)
+
     @property
     def header(self):
         """返回可能解析到的命令头中的信息"""
@@ -109,6 +177,38 @@ class Arpamar(Generic[TDataCollection]):
                 for vv in sub_opts.values():
                     self.other_args = {**self.other_args, **vv['args']}
 
+    def _arg_tables(self) -> List[Dict[str, Any]]:
+        tables = [self.main_args, self.other_args]
+        tables.extend(v['args'] for v in self._options.values())
+        for v in self._subcommands.values():
+            tables.append(v['args'])
+            tables.extend(vv['args'] for vv in v['options'].values())
+        return tables
+
+    async def resolve_async(self):
+        """
+        并发等待所有参数的异步转换, 并以转换后的值替换结果中的 LazyValue
+
+        任一转换失败时返回失败的 Arpamar (或在 raise_exception 时抛出异常)
+        """
+        tables = self._arg_tables()
+        pending = {
+            id(v): v for table in tables for v in table.values()
+            if isinstance(v, LazyValue) and v.awaitable and not v.resolved
+        }
+        if not pending:
+            return self
+        for res in await asyncio.gather(*(v.resolve() for v in pending.values()), return_exceptions=True):
+            if isinstance(res, BaseException):
+                if self.source.meta.raise_exception:
+                    raise res
+                return self._fail(res)
+        for table in tables:
+            for k, v in table.items():
+                if isinstance(v, LazyValue) and v.awaitable:
+                    table[k] = v.value
+        return self
+
     def behave_cancel(self):
         raise BehaveCancelled
 
@@ -130,6 +230,45 @@ class Arpamar(Generic[TDataCollection]):
                     return self._fail(e)
         return self
 
+    async def execute_async(self, behaviors: Optional[List[T_ABehavior]] = None):
+        """
+        execute 的异步版本, 在当前的事件循环中等待异步的 action 与行为器
+
+        命令的 meta.concurrent 为真时, 行为器依 requires 分层, 同一层内的行为器并发执行;
+        同步的行为器在设置了 config.executor 时于其中运行. 取消与失败按行为器的声明顺序处理
+        """
+        await self.source.behaviors[0].operate_async(self)  # type: ignore
+        if self.source.meta.concurrent:
+            for level in requirement_levels([*self.source.behaviors[1:], *(behaviors or [])]):
+                for res in await asyncio.gather(*(self._operate(b) for b in level), return_exceptions=True):
+                    if isinstance(res, OutBoundsBehave):
+                        return self._fail(res)
+                    if isinstance(res, BaseException) and not isinstance(res, BehaveCancelled):
+                        raise res
+        elif behaviors := [*self.source.behaviors[1:], *(behaviors or [])]:
+            exc_behaviors = []
+            for behavior in behaviors:
+                exc_behaviors.extend(requirement_handler(behavior))
+            for b in exc_behaviors:
+                try:
+                    if isawaitable(res := b.operate(self)):  # type: ignore
+                        await res
+                except BehaveCancelled:
+                    continue
+                except OutBoundsBehave as e:
+                    return self._fail(e)
+        return self
+
+    async def _operate(self, behavior: T_ABehavior):
+        if iscoroutinefunction(behavior.operate):
+            return await behavior.operate(self)  # type: ignore
+        if config.executor:
+            return await asyncio.get_running_loop().run_in_executor(
+                config.executor, behavior.operate, self  # type: ignore
+            )
+        if isawaitable(res := behavior.operate(self)):  # type: ignore
+            await res
+
     def _fail(self, exc: Union[Type[BaseException], BaseException, str]):
         arp = Arpamar(self.source)
         arp.matched = False
@@ -262,6 +401,16 @@ class Arpamar(Generic[TDataCollection]):
     def __getattr__(self, item):
         return self.all_matched_args.get(item)
 
+    def record(self) -> ArpamarRecord:
+        """生成该结果的精简形式"""
+        main_args = {k: v for k, v in self.main_args.items() if k not in ('__varargs__', '__kwargs__', '__kwonly__')}
+        error = self.error_info
+        return ArpamarRecord(
+            self.source.path, self.matched, self.head_matched, _plain(self.header), _plain(main_args),
+            _plain(self.options), _plain(self.subcommands),
+            None if error is None else error if isinstance(error, str) else repr(error), list(self.error_data)
+        )
+
     def __repr__(self):
         if self.error_info:
             attrs = ((s, getattr(self, s)) for s in ["matched", "head_matched", "error_data", "error_info"])
@@ -279,3 +428,28 @@ class Arpamar(Generic[TDataCollection]):
             other_args.pop('__kwonly__', None)
             attrs.append(("other_args", other_args))
             return ", ".join(f"{a}={v}" for a, v in attrs if v)
+
+
+class RejectedArpamar(Arpamar):
+    """
+    命令头不匹配时共享的结果, 仅在命名空间开启 fast_reject 时使用
+
+    该结果不可修改; 与通用流程一样, error_info 为 ParamsUnmatched 的 repr, 但其中以命令名代替实际的命令头;
+    error_data 为空
+    """
+
+    def __init__(self, alc: "Alconna"):
+        super().__init__(alc)
+        self._error_info = repr(ParamsUnmatched(config.lang.require("header.error").format(target=alc.name)))
+        self._error_data = ()  # type: ignore
+        self.main_args = MappingProxyType({})  # type: ignore
+        self.other_args = MappingProxyType({})  # type: ignore
+        self._options = MappingProxyType({})  # type: ignore
+        self._subcommands = MappingProxyType({})  # type: ignore
+        self._record = frozenset()  # type: ignore
+        self.__dict__['_frozen'] = True
+
+    def __setattr__(self, key, value):
+        if self.__dict__.get('_frozen'):
+            raise AttributeError(f"{self.__class__.__name__} is immutable")
+        super().__setattr__(key, value)
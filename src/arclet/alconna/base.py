@@ -1,12 +1,16 @@
 """Alconna 的基础内容相关"""
 
 import re
+from itertools import repeat
 from dataclasses import dataclass, field
-from typing import Union, Dict, Callable, Any, Optional, Sequence, List, TypedDict, Set, FrozenSet
+from typing import (
+    Union, Dict, Callable, Any, Optional, Sequence, List, TypedDict, Set, FrozenSet, Tuple, NamedTuple
+)
 
 from .args import Args
 from .exceptions import InvalidParam
 from .config import config
+from .util import split, find_separator
 from .components.action import ArgAction
 
 
@@ -155,11 +159,224 @@ class SubcommandResult(TypedDict):
     options: Dict[str, OptionResult]
 
 
-class StrMounter(List[str]):
-    pass
+class TokenTable(NamedTuple):
+    """
+    切分后的消息单元表
+
+    第 i 个单元若为文本, 则其内容为 sources[i][starts[i]:ends[i]]; 否则 sources[i] 即为该单元, 且 starts[i] 为 -1
+    """
+    sources: Sequence[Any]
+    starts: Sequence[int]
+    ends: Sequence[int]
+
+    def units(self) -> List[Any]:
+        return [src[s:e] if s >= 0 else src for src, s, e in zip(self.sources, self.starts, self.ends)]
+
+
+class TokenStream:
+    """
+    以游标访问的消息单元流
+
+    游标由 (单元序号, 单元内偏移) 组成; 取出、放回与以其他分隔符切分单元均只移动下标, 不会重建字符串或列表
+    """
+    table: TokenTable
+    size: int
+    index: int
+    offset: int
+
+    __slots__ = "table", "size", "index", "offset", "_history", "_cuts", "_redirects", "_overrides"
+
+    def __init__(self, table: TokenTable):
+        self.table = table
+        self.size = len(table.sources)
+        self.index = 0
+        self.offset = 0
+        self._history: List[Tuple[int, int]] = []
+        # (单元序号, 偏移) -> 该分片的终点偏移, 由以其他分隔符切分单元时产生
+        self._cuts: Dict[Tuple[int, int], int] = {}
+        # (单元序号, 偏移) -> 新的偏移, 由以后缀替换分片时产生
+        self._redirects: Dict[Tuple[int, int], int] = {}
+        self._overrides: Dict[Tuple[int, int], Any] = {}
+
+    def _piece(self, index: int, offset: int, separators: Optional[Tuple[str, ...]], move: bool):
+        src, start, end = self.table.sources[index], self.table.starts[index], self.table.ends[index]
+        while self._redirects and (index, offset) in self._redirects:
+            offset = self._redirects[(index, offset)]
+        if self._overrides and (index, offset) in self._overrides:
+            data = self._overrides[(index, offset)]
+            return data, isinstance(data, str), index + 1, 0
+        if start < 0:
+            return src, False, index + 1, 0
+        length = end - start
+        stop = self._cuts.get((index, offset), length)
+        if separators:
+            sep = find_separator(src, separators, start + offset, start + stop) - start
+            if sep >= 0:
+                if sep + 1 < stop and move:
+                    self._cuts[(index, offset)] = sep
+                    if stop != length:
+                        self._cuts[(index, sep + 1)] = stop
+                    return src[start + offset:start + sep], True, index, sep + 1
+                return src[start + offset:start + sep], True, *self._next(index, stop, length)
+        return src[start + offset:start + stop], True, *self._next(index, stop, length)
+
+    @staticmethod
+    def _next(index: int, stop: int, length: int):
+        return (index + 1, 0) if stop == length else (index, stop + 1)
+
+    def pop(self, separators: Optional[Tuple[str, ...]] = None, move: bool = True) -> Tuple[Any, bool]:
+        """取出下一个单元, separators 不为空时以其切分当前的文本单元"""
+        if self.index == self.size:
+            return "", True
+        data, is_str, index, offset = self._piece(self.index, self.offset, separators, move)
+        if move:
+            self._history.append((self.index, self.offset))
+            self.index, self.offset = index, offset
+        return data, is_str
+
+    def pushback(self, data: Any, replace: bool = False):
+        """放回上一个取出的单元; replace 为真时以 data 替换该单元"""
+        if not data:
+            return
+        current = (self.index, self.offset)
+        while self._history and self._history[-1] >= current:
+            self._history.pop()
+        self.index, self.offset = self._history.pop() if self._history else (
+            (self.index, 0) if self.offset else (max(self.index - 1, 0), 0)
+        )
+        if not replace:
+            return
+        index, offset = self.index, self.offset
+        while (index, offset) in self._redirects:
+            offset = self._redirects[(index, offset)]
+        src, start, end = self.table.sources[index], self.table.starts[index], self.table.ends[index]
+        if isinstance(data, str) and start >= 0 and (index, offset) not in self._overrides:
+            stop = self._cuts.get((index, offset), end - start)
+            if src[start + offset:start + stop].endswith(data):
+                if (new := stop - len(data)) != offset:
+                    self._redirects[(index, offset)] = new
+                    if stop != end - start:
+                        self._cuts[(index, new)] = stop
+                return
+        self._overrides[(index, offset)] = data
+
+    def release(self, separators: Optional[Tuple[str, ...]] = None, recover: bool = False) -> List[Any]:
+        """获取剩余的所有单元, separators 不为空时以其切分文本单元"""
+        result = []
+        index, offset = (0, 0) if recover else (self.index, self.offset)
+        while index < self.size:
+            data, is_str, index, offset = self._piece(index, offset, None, False)
+            if separators and is_str:
+                result.extend(split(data, separators))
+            else:
+                result.append(data)
+        return result
+
+    def match(self, pattern: "re.Pattern", groups: Sequence[int]) -> Optional["re.Match"]:
+        """
+        以单个正则一次匹配游标后的若干文本单元, 正则的各个分组须与这些单元逐一重合
+
+        匹配成功时游标越过这些单元; 单元被切分或替换过时不做匹配
+        """
+        index, count = self.index, len(groups)
+        if self.offset or self._cuts or self._redirects or self._overrides or index + count > self.size:
+            return
+        sources, starts, ends = self.table
+        if starts[index] < 0 or not (mat := pattern.match(source := sources[index], starts[index])):
+            return
+        for i, group in enumerate(groups, index):
+            if sources[i] is not source or mat.span(group) != (starts[i], ends[i]):
+                return
+        self._history.extend((i, 0) for i in range(index, index + count))
+        self.index += count
+        return mat
+
+    def texts(self, count: int) -> Optional[List[str]]:
+        """
+        一次取出游标后 count 个单元的文本, 不移动游标
+
+        这些单元中有非文本, 或单元被切分、替换过时返回 None
+        """
+        index, stop = self.index, self.index + max(count, 0)
+        if self.offset or self._cuts or self._redirects or self._overrides or stop > self.size:
+            return
+        sources, starts, ends = self.table
+        if min(starts[index:stop], default=0) < 0:
+            return
+        return [src[start:end] for src, start, end in zip(sources[index:stop], starts[index:stop], ends[index:stop])]
+
+    def skip(self, count: int):
+        """游标越过 count 个完整的单元"""
+        self._history.extend(zip(range(self.index, self.index + count), repeat(0)))
+        self.index += count
+
+    def remaining(self, separators: Optional[Tuple[str, ...]] = None) -> int:
+        """剩余的单元数; 未以其他分隔符切分过单元时无需遍历剩余部分"""
+        if separators or self._cuts or self._overrides:
+            return len(self.release(separators))
+        return self.size - self.index
+
+    def push(self, *data: Any):
+        """在末尾追加单元, 文本不会再被切分"""
+        if not isinstance(self.table.sources, list):
+            self.table = TokenTable(*map(list, self.table))
+        for d in data:
+            if not d:
+                continue
+            if isinstance(d, str) and self.size and self.table.starts[-1] >= 0:
+                if self.index == self.size:
+                    self.index, self.offset = self.size - 1, 0
+            self.table.sources.append(d)
+            self.table.starts.append(0 if isinstance(d, str) else -1)
+            self.table.ends.append(len(d) if isinstance(d, str) else -1)
+            self.size += 1
+        return self
+
+
+class TokenizedMessage:
+    """
+    预先切分好的消息, 可在多个命令的分析器之间共享
+
+    每种切分方式 (分析器类型, 分隔符, 是否切分换行) 只会对原始消息切分一次
+    """
+    origin: Any
+    __slots__ = "origin", "_cache"
+
+    def __init__(self, origin: Any):
+        self.origin = origin
+        self._cache: Dict[Tuple[Any, FrozenSet[str], bool], List[Any]] = {}
+
+    def table(self, analyser_type: Any, separators: FrozenSet[str], crlf: bool) -> TokenTable:
+        """获取以指定方式切分后的单元表, 其由所有使用者共享"""
+        if (key := (analyser_type, separators, crlf)) not in self._cache:
+            self._cache[key] = [analyser_type.tokenize(self.origin, separators, crlf), None]
+        return self._cache[key][0]
+
+    def token(self, analyser_type: Any, separators: FrozenSet[str], crlf: bool) -> int:
+        """获取以指定方式切分后的消息的缓存标记"""
+        cache = self._cache[(analyser_type, separators, crlf)]
+        if cache[1] is None:
+            cache[1] = analyser_type.generate_token(cache[0].units())
+        return cache[1]
+
+    @staticmethod
+    def key_of(message: Any) -> Any:
+        """批量解析时用于识别相同消息的键, 消息无法被哈希时返回 None"""
+        if isinstance(message, TokenizedMessage):
+            message = message.origin
+        if isinstance(message, str):
+            return message
+        try:
+            hash(key := (message.__class__, tuple(message)))
+            return key
+        except TypeError:
+            return None
+
+    def __repr__(self):
+        return f"TokenizedMessage({self.origin!r})"
 
 
 __all__ = [
     "CommandNode", "Option", "Subcommand", "OptionResult", "SubcommandResult", "Sentence",
-    "StrMounter"
+    "TokenTable", "TokenStream", "TokenizedMessage"
 ]
@@ -1,4 +1,6 @@
+import asyncio
 import inspect
+from functools import partial
 from types import LambdaType
 from typing import Optional, Dict, List, Callable, Any, Sequence, TYPE_CHECKING, Union
 from nepattern import AnyOne, AllParam, type_parser
@@ -54,20 +56,54 @@ class ArgAction:
                     additional_values = loop.run_until_complete(self.action(*_varargs, **kwargs))
             else:
                 additional_values = self.action(*_varargs, **kwargs)
-            if not additional_values:
-                return option_dict
-            if not isinstance(additional_values, Sequence):
-                option_dict['result'] = additional_values
-                return option_dict
-            for i, k in enumerate(option_dict.keys()):
-                if i == len(additional_values):
-                    break
-                option_dict[k] = additional_values[i]
+            return self._merge(option_dict, additional_values)
+        except Exception as e:
+            if raise_exception:
+                raise e
+        return option_dict
+
+    async def handle_async(
+            self,
+            option_dict: dict,
+            varargs: Optional[List] = None,
+            kwargs: Optional[Dict] = None,
+            raise_exception: bool = False,
+            concurrent: bool = False,
+    ):
+        """
+        handle 的异步版本, 在当前的事件循环中等待异步的 action 并取回其返回值
+
+        concurrent 为真且设置了 config.executor 时, 同步的 action 在其中运行, 否则直接调用
+        """
+        _varargs = list(option_dict.values())
+        _varargs.extend(varargs or [])
+        kwargs = kwargs or {}
+        try:
+            if concurrent and config.executor and not is_async(self.action):
+                additional_values = await asyncio.get_running_loop().run_in_executor(
+                    config.executor, partial(self.action, *_varargs, **kwargs)
+                )
+            elif inspect.isawaitable(additional_values := self.action(*_varargs, **kwargs)):
+                additional_values = await additional_values
+            return self._merge(option_dict, additional_values)
         except Exception as e:
             if raise_exception:
                 raise e
         return option_dict
 
+    @staticmethod
+    def _merge(option_dict: dict, additional_values: Any):
+        if not additional_values:
+            return option_dict
+        if not isinstance(additional_values, Sequence):
+            option_dict['result'] = additional_values
+            return option_dict
+        for i, k in enumerate(option_dict.keys()):
+            if i == len(additional_values):
+                break
+            option_dict[k] = additional_values[i]
+        return option_dict
+
     @staticmethod
     def __validator__(action: Union[Callable, "ArgAction", None], args: "Args"):
         if not action:
@@ -99,7 +135,7 @@ class ArgAction:
         return ArgAction(action)
 
 
-def _exec_args(args: Dict[str, Any], func: ArgAction, source: 'Alconna'):
+def _split_args(args: Dict[str, Any]):
     result_dict = args.copy()
     kwargs = {}
     kwonly = {}
@@ -116,8 +152,11 @@ def _exec_args(args: Dict[str, Any], func: ArgAction, source: 'Alconna'):
         kwonly = result_dict.pop('__kwonly__')
         for k in kwonly:
             result_dict.pop(k)
-    addition_kwargs = {**kwonly, **kwargs}
-    res = func.handle(result_dict, varargs, addition_kwargs, source.meta.raise_exception)
+    return result_dict, varargs, {**kwonly, **kwargs}, (kwargs, kw_key, varargs, var_key)
+
+
+def _update_args(args: Dict[str, Any], res: Dict[str, Any], rest: tuple):
+    kwargs, kw_key, varargs, var_key = rest
     if kw_key:
         res[kw_key] = kwargs
     if var_key:
@@ -125,6 +164,18 @@ def _exec_args(args: Dict[str, Any], func: ArgAction, source: 'Alconna'):
     args.update(res)
 
 
+def _exec_args(args: Dict[str, Any], func: ArgAction, source: 'Alconna'):
+    result_dict, varargs, addition_kwargs, rest = _split_args(args)
+    res = func.handle(result_dict, varargs, addition_kwargs, source.meta.raise_exception)
+    _update_args(args, res, rest)
+
+
+async def _exec_args_async(args: Dict[str, Any], func: ArgAction, source: 'Alconna', concurrent: bool):
+    result_dict, varargs, addition_kwargs, rest = _split_args(args)
+    res = await func.handle_async(result_dict, varargs, addition_kwargs, source.meta.raise_exception, concurrent)
+    _update_args(args, res, rest)
+
+
 def _exec(data: Union['OptionResult', 'SubcommandResult'], func: ArgAction, source: 'Alconna'):
     if not data['args']:
         data['value'] = func.handle({}, [], {}, source.meta.raise_exception)
@@ -132,6 +183,15 @@ def _exec(data: Union['OptionResult', 'SubcommandResult'], func: ArgAction, sour
     _exec_args(data['args'], func, source)
 
 
+async def _exec_async(
+    data: Union['OptionResult', 'SubcommandResult'], func: ArgAction, source: 'Alconna', concurrent: bool
+):
+    if not data['args']:
+        data['value'] = await func.handle_async({}, [], {}, source.meta.raise_exception, concurrent)
+        return
+    await _exec_args_async(data['args'], func, source, concurrent)
+
+
 class ActionHandler(ArpamarBehavior):
     def operate(self, interface: "Arpamar"):
         interface.clean()
@@ -146,3 +206,32 @@ class ActionHandler(ArpamarBehavior):
         for path, action in source.action_list['subcommands'].items():
             if d := interface.query(path, None):
                 _exec(d, action, source)  # type: ignore
+
+    async def operate_async(self, interface: "Arpamar"):
+        """
+        operate 的异步版本, 由 Arpamar.execute_async 调用
+
+        命令的 meta.concurrent 为真时, 主参数、各选项与各子命令的 action 互不依赖, 将被并发执行,
+        同步的 action 在设置了 config.executor 时于其中运行
+        """
+        interface.clean()
+        source = interface.source
+        concurrent = source.meta.concurrent
+        tasks = []
+
+        if action := source.action_list['main']:
+            tasks.append(_exec_args_async(interface.main_args, action, source, concurrent))
+
+        for path, action in source.action_list['options'].items():
+            if d := interface.query(path, None):
+                tasks.append(_exec_async(d, action, source, concurrent))  # type: ignore
+        for path, action in source.action_list['subcommands'].items():
+            if d := interface.query(path, None):
+                tasks.append(_exec_async(d, action, source, concurrent))  # type: ignore
+        if not concurrent:
+            for task in tasks:
+                await task
+            return
+        for res in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(res, BaseException):
+                raise res
@@ -1,6 +1,6 @@
 from abc import ABCMeta, abstractmethod
 from functools import lru_cache
-from typing import TYPE_CHECKING, Union, List, Type
+from typing import TYPE_CHECKING, Union, List, Type, Dict
 from inspect import isclass
 
 if TYPE_CHECKING:
@@ -35,3 +35,33 @@ def requirement_handler(behavior: T_ABehavior) -> "List[T_ABehavior]":
             result.extend(requirement_handler(i))
     result.append(behavior)
     return result
+
+
+def requirement_levels(behaviors: List[T_ABehavior]) -> "List[List[T_ABehavior]]":
+    """
+    依据 requires 将行为器分层, 每个行为器只出现一次
+
+    每层的行为器只依赖之前的层, 因此同一层内的行为器可以并发执行; 层内的顺序与 requirement_handler 一致
+    """
+    depth: Dict[int, int] = {}
+    order: "List[T_ABehavior]" = []
+
+    def _visit(behavior: T_ABehavior) -> int:
+        if (key := id(behavior)) in depth:
+            return depth[key]
+        depth[key] = max(
+            (
+                _visit(i) + 1 for i in getattr(behavior, "requires", [])
+                if (isclass(i) and issubclass(i, ArpamarBehavior)) or isinstance(i, ArpamarBehavior)
+            ),
+            default=0
+        )
+        order.append(behavior)
+        return depth[key]
+
+    for b in behaviors:
+        _visit(b)
+    levels: "List[List[T_ABehavior]]" = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for b in order:
+        levels[depth[id(b)]].append(b)
+    return levels
@@ -2,6 +2,7 @@ import asyncio
 import json
 from pathlib import Path
 from contextlib import contextmanager
+from concurrent.futures import Executor
 from typing import Union, Dict, Final, Optional, Set, List, Tuple, ContextManager
 from dataclasses import dataclass, field
 
@@ -14,6 +15,7 @@ class Namespace:
     fuzzy_match: bool = field(default=False)
     raise_exception: bool = field(default=False)
     enable_message_cache: bool = field(default=True)
+    fast_reject: bool = field(default=False)
 
     def __eq__(self, other):
         return isinstance(other, Namespace) and other.name == self.name
@@ -78,6 +80,7 @@ class _LangConfig:
 class _AlconnaConfig:
     lang: _LangConfig = _LangConfig()
     loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    executor: Optional[Executor] = None
     command_max_count: int = 200
     message_max_cache: int = 100
     fuzzy_threshold: float = 0.6
@@ -106,6 +109,11 @@ class _AlconnaConfig:
         """设置事件循环"""
         cls.loop = loop
 
+    @classmethod
+    def set_executor(cls, executor: Optional[Executor]) -> None:
+        """设置异步解析时运行同步 action 与行为器的线程池; 为 None 时直接在事件循环中调用"""
+        cls.executor = executor
+
 
 @contextmanager
 def namespace(name: Union[Namespace, str]) -> ContextManager[Namespace]:
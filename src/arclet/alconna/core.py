@@ -7,7 +7,7 @@ from dataclasses import dataclass, field
 from .config import config, Namespace
 from .analysis.base import compile
 from .args import Args
-from .base import CommandNode, Option, Subcommand
+from .base import CommandNode, Option, Subcommand, TokenizedMessage
 from .builtin import HelpOption, ShortcutOption, CompletionOption
 from .typing import TDataCollection
 from .manager import command_manager
@@ -33,6 +33,8 @@ class CommandMeta:
     raise_exception: bool = field(default=False)
     hide: bool = field(default=False)
     keep_crlf: bool = field(default=False)
+    codegen: bool = field(default=False)
+    concurrent: bool = field(default=False)
 
 
 class AlconnaGroup(CommandNode):
@@ -88,12 +90,13 @@ class AlconnaGroup(CommandNode):
 
     def reset_namespace(self, namespace: Union[str, Namespace]):
         """重新设置命名空间"""
-        command_manager.delete(self)
-        if isinstance(namespace, str):
-            namespace = config.namespaces.setdefault(namespace, Namespace(namespace))
-        self.namespace = namespace.name
-        self._hash = self._calc_hash()
-        command_manager.register(self)
+        with command_manager.transaction():
+            command_manager.delete(self)
+            if isinstance(namespace, str):
+                namespace = config.namespaces.setdefault(namespace, Namespace(namespace))
+            self.namespace = namespace.name
+            self._hash = self._calc_hash()
+            command_manager.register(self)
         return self
 
     def __iter__(self):
@@ -110,8 +113,30 @@ class AlconnaGroup(CommandNode):
 
     def parse(self, message: TDataCollection) -> Optional[Arpamar[TDataCollection]]:
         res = None
+        tokens = message if isinstance(message, TokenizedMessage) else TokenizedMessage(message)
+        for command in self.commands:
+            if (res := command.parse(tokens)).matched:  # type: ignore
+                return res
+        return res
+
+    def parse_batch(self, messages: Iterable[TDataCollection]) -> List[Optional[Arpamar[TDataCollection]]]:
+        """批量解析消息, 每个命令只解析尚未被之前的命令匹配的消息"""
+        tokens = [msg if isinstance(msg, TokenizedMessage) else TokenizedMessage(msg) for msg in messages]
+        results: List[Optional[Arpamar]] = [None] * len(tokens)
+        pending = list(range(len(tokens)))
+        for command in self.commands:
+            if not pending:
+                break
+            for i, res in zip(pending, command.parse_batch([tokens[i] for i in pending])):
+                results[i] = res
+            pending = [i for i in pending if not results[i].matched]  # type: ignore
+        return results
+
+    async def parse_async(self, message: TDataCollection) -> Optional[Arpamar[TDataCollection]]:
+        res = None
+        tokens = message if isinstance(message, TokenizedMessage) else TokenizedMessage(message)
         for command in self.commands:
-            if (res := command.parse(message)).matched:
+            if (res := await command.parse_async(tokens)).matched:  # type: ignore
                 return res
         return res
 
@@ -283,12 +308,13 @@ class Alconna(CommandNode):
 
     def reset_namespace(self, namespace: Union[Namespace, str]):
         """重新设置命名空间"""
-        command_manager.delete(self)
-        if isinstance(namespace, str):
-            namespace = config.namespaces.setdefault(namespace, Namespace(namespace))
-        self.namespace = namespace.name
-        self._hash = self._calc_hash()
-        command_manager.register(self)
+        with command_manager.transaction():
+            command_manager.delete(self)
+            if isinstance(namespace, str):
+                namespace = config.namespaces.setdefault(namespace, Namespace(namespace))
+            self.namespace = namespace.name
+            self._hash = self._calc_hash()
+            command_manager.register(self)
         return self
 
     def reset_behaviors(self, behaviors: List[T_ABehavior]):
@@ -338,15 +364,35 @@ class Alconna(CommandNode):
 
     def add(self, name: str, *alias: str, args: Optional[Args] = None, sep: str = " ", help_: Optional[str] = None):
         """链式注册一个 Option"""
-        command_manager.delete(self)
-        names = name.split(sep)
-        name, requires = names[-1], names[:-1]
-        opt = Option(name, args, list(alias), separators=sep, help_text=help_, requires=requires)
-        self.options.append(opt)
-        self._hash = self._calc_hash()
-        command_manager.register(self)
+        with command_manager.transaction():
+            command_manager.delete(self)
+            names = name.split(sep)
+            name, requires = names[-1], names[:-1]
+            opt = Option(name, args, list(alias), separators=sep, help_text=help_, requires=requires)
+            self.options.append(opt)
+            self._hash = self._calc_hash()
+            command_manager.register(self)
         return self
 
+    def _analyse(self, message: TDataCollection, static: bool, interrupt: bool) -> Union[Analyser, Arpamar]:
+        """
+        以借出的分析器解析消息, 解析结束后立即归还, 因此同一命令可以被多个线程或递归地同时解析
+
+        解析被暂停时, 分析器交由调用方继续使用而不再归还
+        """
+        analyser = command_manager.checkout(self) if static else compile(self)
+        try:
+            return analyser.process(message).analyse(interrupt=interrupt)
+        except PauseTriggered:
+            static = False
+            return analyser
+        except BaseException:
+            analyser.reset()
+            raise
+        finally:
+            if static:
+                command_manager.release(self, analyser)
+
     @overload
     def parse(
         self, message, duplication: Type[T_Duplication], static=True, interrupt=False
@@ -370,18 +416,62 @@ class Alconna(CommandNode):
             static: bool = True, interrupt: bool = False
     ) -> Union[Analyser, Arpamar[TDataCollection], T_Duplication]:
         """命令分析功能, 传入字符串或消息链, 返回一个特定的数据集合类"""
-        analyser = command_manager.require(self) if static else compile(self)
-        analyser.process(message)
-        try:
-            arp: Arpamar[TDataCollection] = analyser.analyse(interrupt=interrupt)
-        except PauseTriggered:
-            return analyser
+        if isinstance(arp := self._analyse(message, static, interrupt), Analyser):
+            return arp
         if arp.matched:
             arp = arp.execute()
         if duplication:
             return duplication(self).set_target(arp)
         return arp
 
+    def parse_batch(
+            self, messages: Iterable[TDataCollection], duplication: Optional[Type[T_Duplication]] = None
+    ) -> List[Union[Arpamar[TDataCollection], T_Duplication]]:
+        """
+        批量解析消息, 结果按输入顺序返回
+
+        整批消息只检查一次命令是否被禁用, 并只借出一个分析器; 相同的消息只解析与执行一次, 共享同一个结果
+        """
+        results = []
+        seen: Dict[Any, Arpamar] = {}
+        disabled = command_manager.is_disable(self)
+        analyser = command_manager.checkout(self)
+        try:
+            for message in messages:
+                if (key := TokenizedMessage.key_of(message)) is None or (arp := seen.get(key)) is None:
+                    if disabled:
+                        arp = analyser.process(message).export(fail=True)
+                    elif (arp := analyser.process(message).analyse()).matched:
+                        arp = arp.execute()
+                    if key is not None:
+                        seen[key] = arp
+                results.append(duplication(self).set_target(arp) if duplication else arp)
+        except BaseException:
+            analyser.reset()
+            raise
+        finally:
+            command_manager.release(self, analyser)
+        return results
+
+    async def parse_async(
+            self, message: TDataCollection, duplication: Optional[Type[T_Duplication]] = None,
+            static: bool = True, interrupt: bool = False
+    ) -> Union[Analyser, Arpamar[TDataCollection], T_Duplication]:
+        """
+        parse 的异步版本
+
+        先完成结构上的匹配, 再并发等待所有匹配参数的异步转换函数; action 与行为器在当前的事件循环中被等待
+        """
+        if isinstance(arp := self._analyse(message, static, interrupt), Analyser):
+            return arp
+        if arp.matched:
+            arp = await arp.resolve_async()
+        if arp.matched:
+            arp = await arp.execute_async()
+        if duplication:
+            return duplication(self).set_target(arp)
+        return arp
+
     def __truediv__(self, other):
         self.reset_namespace(other)
         return self
@@ -391,14 +481,15 @@ class Alconna(CommandNode):
         return self
 
     def __add__(self, other):
-        command_manager.delete(self)
-        if isinstance(other, Option):
-            self.options.append(other)
-        elif isinstance(other, str):
-            _part = other.split("/")
-            self.options.append(Option(_part[0], _part[1] if len(_part) > 1 else None))
-        self._hash = self._calc_hash()
-        command_manager.register(self)
+        with command_manager.transaction():
+            command_manager.delete(self)
+            if isinstance(other, Option):
+                self.options.append(other)
+            elif isinstance(other, str):
+                _part = other.split("/")
+                self.options.append(Option(_part[0], _part[1] if len(_part) > 1 else None))
+            self._hash = self._calc_hash()
+            command_manager.register(self)
         return self
 
     def __or__(self, other):
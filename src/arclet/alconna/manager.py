@@ -1,20 +1,197 @@
 """Alconna 负责记录命令的部分"""
+import os
 import weakref
+import threading
 from copy import copy
 from datetime import datetime
-from typing import TYPE_CHECKING, Dict, Optional, Union, List, Tuple, Any
+from collections import deque
+from typing import (
+    TYPE_CHECKING, Dict, Optional, Union, List, Tuple, Any, FrozenSet, Deque, NamedTuple, Iterable, Iterator,
+    Sequence, Callable
+)
 import shelve
 import contextlib
+import importlib
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 
 from .exceptions import ExceedMaxCount
 from .util import Singleton, LruCache
+from .base import TokenizedMessage
 from .typing import TDataCollection, DataCollection
 from .config import config, Namespace
 
 if TYPE_CHECKING:
     from .analysis.analyser import Analyser
     from .core import Alconna, AlconnaGroup, CommandMeta
-    from .arpamar import Arpamar
+    from .arpamar import Arpamar, ArpamarRecord
+
+_regex_meta = frozenset(".^$*+?{}[]\\|()")
+
+
+class DispatchIndex:
+    """
+    命令头部的分派索引
+
+    以命令头与命令名的字面量为键记录可能匹配的命令; 含有正则、{bracket} 或 BasePattern 的命令头, 以及开启模糊匹配的命令会被放入回退列表
+
+    快捷命令同样以字面量为键记录, 由命令管理器在增删快捷命令时同步; 每个键对应的序号列表已与回退列表合并并排好序
+    """
+    entries: List[Union['Alconna', 'AlconnaGroup']]
+    members: List[List['Alconna']]
+    positions: Dict[str, int]
+    literals: Dict[Tuple[Any, FrozenSet[str], bool], Dict[str, List[int]]]
+    shortcuts: Dict[Tuple[Any, FrozenSet[str], bool], Dict[str, List[int]]]
+    fallback: List[int]
+
+    __slots__ = "entries", "members", "positions", "literals", "shortcuts", "fallback"
+
+    def __init__(
+        self,
+        entries: List[Union['Alconna', 'AlconnaGroup']],
+        shortcuts: Iterable[Tuple[str, str]] = (),
+        members: Optional[Dict[str, List['Alconna']]] = None,
+    ):
+        """
+        Args:
+            entries: 命名空间内的命令
+            shortcuts: (命令名, 快捷命令) 的序列
+            members: 命令组名到其命令的映射, 用于尚未写入命令组的合并结果
+        """
+        self.entries = entries
+        self.members = [(members or {}).get(entry.name) or self.commands_of(entry) for entry in entries]
+        self.positions = {}
+        self.literals = {}
+        self.fallback = []
+        for index, entry in enumerate(entries):
+            self.positions[entry.name] = index
+            heads = [(cmd, self.literal_heads(cmd)) for cmd in self.members[index]]
+            if any(h is None for _, h in heads):
+                self.fallback.append(index)
+                continue
+            for cmd, literal in heads:
+                table = self.literals.setdefault(self.group_of(cmd), {})
+                for head in literal:  # type: ignore
+                    if index not in (li := table.setdefault(head, [])):
+                        li.append(index)
+        for table in self.literals.values():
+            for head, li in table.items():
+                table[head] = sorted({*li, *self.fallback})
+        self.set_shortcuts(shortcuts)
+
+    @staticmethod
+    def commands_of(entry: Union['Alconna', 'AlconnaGroup']) -> List['Alconna']:
+        return entry.commands if entry._group else [entry]  # type: ignore  # noqa
+
+    @staticmethod
+    def group_of(command: "Alconna") -> Tuple[Any, FrozenSet[str], bool]:
+        """命令对消息的切分方式, 切分方式相同的命令共享同一个命令头"""
+        return command.analyser_type, frozenset(command.separators), not command.meta.keep_crlf
+
+    @staticmethod
+    def literal_heads(command: "Alconna") -> Optional[List[str]]:
+        """获取命令头的所有字面量, 无法以字面量表示时返回 None"""
+        if command.meta.fuzzy_match or not isinstance(command.command, str):
+            return None
+        if _regex_meta.intersection(command.command):
+            return None
+        if not command.headers:
+            return [command.command]
+        if all(isinstance(h, str) for h in command.headers):
+            return [f"{h}{command.command}" for h in command.headers]
+        return None
+
+    @staticmethod
+    def head_text(message: "TokenizedMessage", group: Tuple[Any, FrozenSet[str], bool]) -> Optional[str]:
+        """获取以该切分方式得到的第一个文本分段, 若消息的第一个单元不是文本则返回 None"""
+        if (table := message.table(*group)).sources and table.starts[0] >= 0:
+            return table.sources[0][table.starts[0]:table.ends[0]]
+        return None
+
+    def set_shortcuts(self, shortcuts: Iterable[Tuple[str, str]]) -> None:
+        """以 (命令名, 快捷命令) 的序列重建快捷命令的索引"""
+        tables: Dict[Tuple[Any, FrozenSet[str], bool], Dict[str, List[int]]] = {}
+        for name, shortcut in shortcuts:
+            if (index := self.positions.get(name)) is None:
+                continue
+            for cmd in self.members[index]:
+                table = tables.setdefault(self.group_of(cmd), {})
+                table[shortcut] = sorted({index, *table.get(shortcut, self.fallback)})
+        self.shortcuts = tables
+
+    def add_shortcut(self, name: str, shortcut: str) -> None:
+        """记录命令的一个快捷命令; 索引以整体替换的方式更新, 并发的查询不会看到修改了一半的状态"""
+        if (index := self.positions.get(name)) is None:
+            return
+        tables = dict(self.shortcuts)
+        for cmd in self.members[index]:
+            table = tables[group] = dict(tables.get(group := self.group_of(cmd), {}))
+            table[shortcut] = sorted({index, *table.get(shortcut, self.fallback)})
+        self.shortcuts = tables
+
+    def remove_shortcut(self, name: str, shortcut: str) -> None:
+        """移除命令的一个快捷命令"""
+        if (index := self.positions.get(name)) is None or index in self.fallback:
+            return
+        tables = dict(self.shortcuts)
+        for cmd in self.members[index]:
+            if shortcut not in (table := tables.get(group := self.group_of(cmd), {})):
+                continue
+            table = tables[group] = dict(table)
+            if (li := [i for i in table[shortcut] if i != index]) == self.fallback:
+                del table[shortcut]
+            else:
+                table[shortcut] = li
+        self.shortcuts = tables
+
+    def candidates(self, message: "TokenizedMessage") -> List[int]:
+        """
+        获取可能匹配该消息的命令的序号, 按注册顺序排列
+
+        返回的列表可能是索引内部的列表, 调用者不应修改它
+        """
+        hits = []
+        heads = {}
+        for group, table in self.literals.items():
+            if (head := heads.setdefault(group, self.head_text(message, group))) is not None and head in table:
+                hits.append(table[head])
+        for group, table in self.shortcuts.items():
+            if group not in heads:
+                heads[group] = self.head_text(message, group)
+            if (head := heads[group]) is not None and head in table:
+                hits.append(table[head])
+        if not hits:
+            return self.fallback
+        if len(hits) == 1:
+            return hits[0]
+        return sorted(set().union(*hits))
+
+    def candidates_many(self, messages: List["TokenizedMessage"]) -> List[List[int]]:
+        """批量获取候选命令的序号, 各切分方式下第一个分段都相同的消息只查询一次"""
+        groups = {*self.literals, *self.shortcuts}
+        memo: Dict[Tuple[Optional[str], ...], List[int]] = {}
+        result = []
+        for message in messages:
+            if (res := memo.get(key := tuple(self.head_text(message, group) for group in groups))) is None:
+                res = memo[key] = self.candidates(message)
+            result.append(res)
+        return result
+
+
+class Registry(NamedTuple):
+    """
+    命令注册表的一个快照
+
+    快照发布后不再被修改; 注册与删除命令时会复制出新的快照并整体替换, 因此读取者无需加锁, 也不会看到修改了一半的状态
+
+    命令组例外: 同名命令组合并时仍使用原有的命令组对象, 其 commands 在新的快照发布后整体替换
+    """
+    commands: Dict[str, Dict[str, Union['Alconna', 'AlconnaGroup']]]
+    dispatch: Dict[str, DispatchIndex]
+    analysers: Dict[int, 'Analyser']
+    """以 id(命令) 为键; 命令在修改期间哈希值会变化, 旧快照仍需能找到其分析器"""
+    pools: Dict[int, Deque['Analyser']]
+    count: int
 
 
 class CommandManager(metaclass=Singleton):
@@ -25,11 +202,12 @@ class CommandManager(metaclass=Singleton):
     """
 
     sign: str
-    current_count: int
     max_count: int
 
-    __commands: Dict[str, Dict[str, Union['Alconna', 'AlconnaGroup']]]
-    __analysers: Dict['Alconna', 'Analyser']
+    __registry: Registry
+    __pending: Optional[Registry]
+    __merging: Dict[int, Tuple['AlconnaGroup', List['Alconna']]]
+    __lock: threading.RLock
     __abandons: List["Alconna"]
     __record: LruCache[int, "Arpamar"]
     __shortcuts: LruCache[str, Union['Arpamar', DataCollection[Union[str, Any]]]]
@@ -38,10 +216,11 @@ class CommandManager(metaclass=Singleton):
         self.cache_path = f"{__file__.replace('manager.py', '')}manager_cache.db"
         self.sign = "ALCONNA::"
         self.max_count = config.command_max_count
-        self.current_count = 0
 
-        self.__commands = {}
-        self.__analysers = {}
+        self.__registry = Registry({}, {}, {}, {}, 0)
+        self.__pending = None
+        self.__merging = {}
+        self.__lock = threading.RLock()
         self.__abandons = []
         self.__shortcuts = LruCache()
         self.__record = LruCache(config.message_max_cache)
@@ -49,7 +228,7 @@ class CommandManager(metaclass=Singleton):
 
     def __del__(self):
         with contextlib.suppress(AttributeError):
-            self.__commands.clear()
+            self.__registry = Registry({}, {}, {}, {}, 0)
             self.__abandons.clear()
             self.__record.clear()
             self.__shortcuts.clear()
@@ -60,16 +239,29 @@ class CommandManager(metaclass=Singleton):
         with contextlib.suppress(FileNotFoundError, KeyError):
             with shelve.open(self.cache_path) as db:
                 self.__shortcuts = db["shortcuts"]  # type: ignore
+        with self.__lock:
+            for namespace in {*self.__registry.dispatch, *(self.__pending.dispatch if self.__pending else ())}:
+                for index in self._indices_of(namespace):
+                    index.set_shortcuts(self._shortcuts_of(namespace))
 
     def dump_cache(self) -> None:
         """保存缓存"""
         with shelve.open(self.cache_path) as db:
             db["shortcuts"] = self.__shortcuts
 
+    @property
+    def registry(self) -> Registry:
+        """当前发布的命令注册表快照"""
+        return self.__registry
+
+    @property
+    def current_count(self) -> int:
+        return self.__registry.count
+
     @property
     def get_loaded_namespaces(self):
         """获取所有命名空间"""
-        return list(self.__commands.keys())
+        return list(self.__registry.commands.keys())
 
     @staticmethod
     def _command_part(command: str) -> Tuple[str, str]:
@@ -80,53 +272,128 @@ class CommandManager(metaclass=Singleton):
         return command_parts[0], command_parts[1]
 
     def get_namespace_config(self, name: str) -> Optional[Namespace]:
-        if name not in self.__commands:
+        if name not in self.__registry.commands:
             return
         return config.namespaces.get(name)
 
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        将期间的多次注册与删除合并为一次发布
+
+        修改已注册的命令 (先删除、修改后再注册) 时使用, 读取者在此期间看到的始终是修改前的快照
+        """
+        with self.__lock:
+            if self.__pending is not None:
+                yield
+                return
+            self.__pending = self.__registry
+            try:
+                yield
+            finally:
+                registry, self.__pending = self.__pending, None
+                self.__registry = registry
+                self._merge_groups()
+
+    def _publish(self, registry: Registry) -> None:
+        if self.__pending is not None:
+            self.__pending = registry
+        else:
+            self.__registry = registry
+            self._merge_groups()
+
+    def _merge_groups(self) -> None:
+        """
+        将发布的注册表中合并的命令写入命令组
+
+        命令组对象保持不变, 其 commands 在新的注册表发布后整体替换, 持有命令组的读取者随之看到合并的命令
+        """
+        for group, commands in self.__merging.values():
+            group.commands = commands
+            group.__handler_help_text__()
+        self.__merging.clear()
+
+    def _dispatch_index(
+        self, namespace: str, entries: Dict[str, Union['Alconna', 'AlconnaGroup']]
+    ) -> DispatchIndex:
+        members = {
+            name: self.__merging[id(entry)][1] for name, entry in entries.items() if id(entry) in self.__merging
+        }
+        return DispatchIndex(list(entries.values()), self._shortcuts_of(namespace), members)
+
     def register(self, command: Union["Alconna", "AlconnaGroup"]) -> None:
         """注册命令解析器, 会同时记录解析器对应的命令"""
         from .analysis.base import compile
-        if self.current_count >= self.max_count:
-            raise ExceedMaxCount
-        if not command._group:   # noqa
-            self.__analysers[command] = compile(command)  # type: ignore
-        else:
-            for cmd in command.commands:  # type: ignore
-                self.__analysers[cmd] = compile(cmd)
-        namespace = self.__commands.setdefault(command.namespace, {})
-        if _cmd := namespace.get(command.name):
-            if _cmd == command:
-                return
-            _cmd.__union__(command)
-        else:
-            namespace[command.name] = command
-            self.current_count += 1
+        compiled = {id(cmd): compile(cmd) for cmd in DispatchIndex.commands_of(command)}
+        with self.__lock:
+            reg = self.__pending or self.__registry
+            if reg.count >= self.max_count:
+                raise ExceedMaxCount
+            analysers, pools = {**reg.analysers, **compiled}, {**reg.pools, **{cmd: deque() for cmd in compiled}}
+            namespace = dict(reg.commands.get(command.namespace, {}))
+            count = reg.count
+            if _cmd := namespace.get(command.name):
+                if _cmd == command:
+                    return self._publish(reg._replace(analysers=analysers, pools=pools))
+                if _cmd._group:  # noqa
+                    # 发布前不修改命令组, 合并的命令在发布后由 _merge_groups 写入
+                    merged = self.__merging.get(id(_cmd), (_cmd, _cmd.commands))[1]
+                    self.__merging[id(_cmd)] = (_cmd, [*merged, *DispatchIndex.commands_of(command)])
+            else:
+                namespace[command.name] = command
+                count += 1
+            self._publish(Registry(
+                {**reg.commands, command.namespace: namespace},
+                {**reg.dispatch, command.namespace: self._dispatch_index(command.namespace, namespace)},
+                analysers, pools, count
+            ))
 
     def require(self, command: "Alconna") -> "Analyser":
         """获取命令解析器"""
         try:
-            return self.__analysers[command]
+            return self.__registry.analysers[id(command)]
         except KeyError as e:
             namespace, name = self._command_part(command.path)
             raise ValueError(config.lang.manager_undefined_command.format(target=f"{namespace}.{name}")) from e
 
+    def checkout(self, command: "Alconna") -> "Analyser":
+        """
+        借出命令的一个分析器, 用完后应以 release 归还
+
+        分析器由 require 得到的分析器复制而来, 与之共享编译结果; 借出的分析器只被一次解析使用, 因而解析可以重入与并发
+        """
+        try:
+            return self.__registry.pools[id(command)].pop()
+        except (IndexError, KeyError):
+            return self.require(command).fork()
+
+    def release(self, command: "Alconna", analyser: "Analyser") -> None:
+        """归还借出的分析器; 命令已被删除或重新注册时分析器被丢弃"""
+        reg = self.__registry
+        if (pool := reg.pools.get(id(command))) is not None and (
+            analyser.command_params is reg.analysers[id(command)].command_params
+        ):
+            pool.append(analyser)
+
     def delete(self, command: Union["Alconna", 'AlconnaGroup', str]) -> None:
         """删除命令"""
         namespace, name = self._command_part(command if isinstance(command, str) else command.path)
-        try:
-            base = self.__commands[namespace][name]
-            if base._group:  # noqa
-                for cmd in base.commands:  # type: ignore
-                    del self.__analysers[cmd]
+        with self.__lock:
+            reg = self.__pending or self.__registry
+            if not (base := reg.commands.get(namespace, {}).get(name)):
+                return
+            analysers, pools = dict(reg.analysers), dict(reg.pools)
+            for cmd in self.__merging.pop(id(base), (base, DispatchIndex.commands_of(base)))[1]:
+                analysers.pop(id(cmd), None)
+                pools.pop(id(cmd), None)
+            commands, dispatch = dict(reg.commands), dict(reg.dispatch)
+            commands[namespace] = {k: v for k, v in commands[namespace].items() if k != name}
+            if commands[namespace]:
+                dispatch[namespace] = self._dispatch_index(namespace, commands[namespace])
             else:
-                del self.__analysers[base]  # type: ignore
-            del self.__commands[namespace][name]
-            self.current_count -= 1
-        finally:
-            if self.__commands.get(namespace) == {}:
-                del self.__commands[namespace]
-            return None
+                del commands[namespace]
+                dispatch.pop(namespace, None)
+            self._publish(Registry(commands, dispatch, analysers, pools, reg.count - 1))
 
     def is_disable(self, command: "Alconna") -> bool:
         """判断命令是否被禁用"""
@@ -136,7 +403,7 @@ class CommandManager(metaclass=Singleton):
         """启用命令"""
         if isinstance(command, str):
             namespace, name = self._command_part(command)
-            if namespace not in self.__commands or name not in self.__commands[namespace]:
+            if name not in self.__registry.commands.get(namespace, {}):
                 raise ValueError(config.lang.manager_undefined_command.format(target=command))
             temp = [cmd for cmd in self.__abandons if cmd.path == f"{namespace}.{name}"]
             for cmd in temp:
@@ -154,11 +421,14 @@ class CommandManager(metaclass=Singleton):
         from .arpamar import Arpamar
         namespace, name = self._command_part(target if isinstance(target, str) else target.path)
         try:
-            _ = self.__commands[namespace][name]
+            _ = self.__registry.commands[namespace][name]
         except KeyError as e:
             raise ValueError(config.lang.manager_undefined_command.format(target=f"{namespace}.{name}")) from e
         if isinstance(source, Arpamar) and source.matched or not isinstance(source, Arpamar):
-            self.__shortcuts.set(f"{namespace}.{name}::{shortcut}", source)
+            with self.__lock:
+                self.__shortcuts.set(f"{namespace}.{name}::{shortcut}", source)
+                for index in self._indices_of(namespace):
+                    index.add_shortcut(name, shortcut)
         else:
             raise ValueError(config.lang.manager_incorrect_shortcut.format(target=f"{shortcut}"))
 
@@ -167,7 +437,7 @@ class CommandManager(metaclass=Singleton):
         if target:
             namespace, name = self._command_part(target if isinstance(target, str) else target.path)
             try:
-                _ = self.__commands[namespace][name]
+                _ = self.__registry.commands[namespace][name]
             except KeyError as e:
                 raise ValueError(config.lang.manager_undefined_command.format(target=f"{namespace}.{name}")) from e
             try:
@@ -181,20 +451,38 @@ class CommandManager(metaclass=Singleton):
                 return self.__shortcuts.get(next(filter(lambda x: x.split("::")[1] == shortcut, self.__shortcuts)))
             raise ValueError(config.lang.manager_undefined_shortcut.format(target=f"{shortcut}"))
 
+    def get_shortcut(
+        self, shortcut: str, target: "Alconna"
+    ) -> Optional[Union['Arpamar', DataCollection[Union[str, Any]]]]:
+        """查找目标命令的快捷命令, 与 find_shortcut 不同, 不存在时返回 None 而不抛出异常"""
+        namespace, name = self._command_part(target.path)
+        if name not in self.__registry.commands.get(namespace, ()):
+            return
+        return self.__shortcuts.get(f"{namespace}.{name}::{shortcut}") or None
+
     def delete_shortcut(self, shortcut: str, target: Optional[Union["Alconna", str]] = None):
         """删除快捷命令"""
-        res = self.find_shortcut(shortcut, target)
-        with contextlib.suppress(StopIteration):
-            self.__shortcuts.delete(next(filter(lambda x: self.__shortcuts[x] == res, self.__shortcuts)))
+        self.find_shortcut(shortcut, target)
+        if target:
+            namespace, name = self._command_part(target if isinstance(target, str) else target.path)
+            key = f"{namespace}.{name}::{shortcut}"
+        else:
+            key = next(filter(lambda x: x.split("::")[1] == shortcut, self.__shortcuts))
+        with self.__lock:
+            self.__shortcuts.delete(key)
+            path = key.split("::", maxsplit=1)[0]
+            for namespace in {*self.__registry.dispatch, *(self.__pending.dispatch if self.__pending else ())}:
+                if path.startswith(f"{namespace}."):
+                    for index in self._indices_of(namespace):
+                        index.remove_shortcut(path[len(namespace) + 1:], shortcut)
         return
 
     def set_disable(self, command: Union["Alconna", str]) -> None:
         """禁用命令"""
         if isinstance(command, str):
             namespace, name = self._command_part(command)
-            if namespace not in self.__commands or name not in self.__commands[namespace]:
+            if not (cmd := self.__registry.commands.get(namespace, {}).get(name)):
                 raise ValueError(config.lang.manager_undefined_command.format(target=f"{namespace}.{name}"))
-            cmd = self.__commands[namespace][name]
             return (
                 self.__abandons.extend(cmd.commands)  # type: ignore
                 if hasattr(cmd, 'commands') else self.__abandons.append(cmd)  # type: ignore
@@ -204,27 +492,149 @@ class CommandManager(metaclass=Singleton):
     def get_command(self, command: str) -> Union["Alconna", "AlconnaGroup", None]:
         """获取命令"""
         namespace, name = self._command_part(command)
-        if namespace not in self.__commands or name not in self.__commands[namespace]:
-            return None
-        return self.__commands[namespace][name]
+        return self.__registry.commands.get(namespace, {}).get(name)
 
     def get_commands(self, namespace: Union[str, Namespace] = '') -> List[Union["Alconna", "AlconnaGroup"]]:
         """获取命令列表"""
+        commands = self.__registry.commands
         if not namespace:
-            return [ana for namespace in self.__commands for ana in self.__commands[namespace].values()]
+            return [ana for namespace in commands for ana in commands[namespace].values()]
         if isinstance(namespace, Namespace):
-            namespace = Namespace.name
-        if namespace not in self.__commands:
+            namespace = namespace.name
+        if namespace not in commands:
             return []
-        return list(self.__commands[namespace].values())
+        return list(commands[namespace].values())
+
+    def _shortcuts_of(self, namespace: str) -> List[Tuple[str, str]]:
+        """获取该命名空间下的 (命令名, 快捷命令), 用于构建分派索引"""
+        res = []
+        for key in self.__shortcuts:
+            target, shortcut = key.split("::", maxsplit=1)
+            if target.startswith(f"{namespace}."):
+                res.append((target[len(namespace) + 1:], shortcut))
+        return res
+
+    def _indices_of(self, namespace: str) -> List[DispatchIndex]:
+        """当前快照与进行中的修改里该命名空间的分派索引"""
+        indices = {}
+        for reg in (self.__registry, self.__pending):
+            if reg and (index := reg.dispatch.get(namespace)):
+                indices[id(index)] = index
+        return list(indices.values())
 
     def broadcast(
         self, message: TDataCollection, namespace: Union[str, Namespace] = ''
     ) -> Optional['Arpamar[TDataCollection]']:
-        """将一段命令广播给当前空间内的所有命令"""
-        for cmd in self.get_commands(namespace):
-            if (res := cmd.parse(message)) and res.matched:
-                return res
+        """
+        将一段命令广播给当前空间内的所有命令
+
+        命令会先经过分派索引的筛选, 只有命令头可能匹配的命令才会进行解析;
+        消息只会被切分一次, 切分结果在所有命令间共享
+        """
+        if isinstance(namespace, Namespace):
+            namespace = namespace.name
+        tokens = message if isinstance(message, TokenizedMessage) else TokenizedMessage(message)
+        reg = self.__registry
+        for name in ([namespace] if namespace else list(reg.commands.keys())):
+            if not (index := reg.dispatch.get(name)):
+                continue
+            for i in index.candidates(tokens):
+                if (res := index.entries[i].parse(tokens)) and res.matched:  # type: ignore
+                    return res
+
+    async def broadcast_async(
+        self, message: TDataCollection, namespace: Union[str, Namespace] = ''
+    ) -> Optional['Arpamar[TDataCollection]']:
+        """broadcast 的异步版本, 命令以 parse_async 解析"""
+        if isinstance(namespace, Namespace):
+            namespace = namespace.name
+        tokens = message if isinstance(message, TokenizedMessage) else TokenizedMessage(message)
+        reg = self.__registry
+        for name in ([namespace] if namespace else list(reg.commands.keys())):
+            if not (index := reg.dispatch.get(name)):
+                continue
+            for i in index.candidates(tokens):
+                if (res := await index.entries[i].parse_async(tokens)) and res.matched:  # type: ignore
+                    return res
+
+    def broadcast_batch(
+        self, messages: Iterable[TDataCollection], namespace: Union[str, Namespace] = ''
+    ) -> List[Optional['Arpamar[TDataCollection]']]:
+        """
+        批量广播消息, 结果按输入顺序返回, 未匹配的消息对应 None
+
+        相同的消息只解析一次; 分派索引按第一个分段批量查询, 每个候选命令以 parse_batch 一并解析其所有候选消息,
+        消息依然由其第一个匹配的候选命令解析, 结果与逐条 broadcast 一致
+        """
+        if isinstance(namespace, Namespace):
+            namespace = namespace.name
+        order, tokens, unique = [], [], {}
+        for message in messages:
+            if (key := TokenizedMessage.key_of(message)) is None or (pos := unique.get(key)) is None:
+                pos = len(tokens)
+                tokens.append(message if isinstance(message, TokenizedMessage) else TokenizedMessage(message))
+                if key is not None:
+                    unique[key] = pos
+            order.append(pos)
+        results: List[Optional['Arpamar']] = [None] * len(tokens)
+        pending = list(range(len(tokens)))
+        reg = self.__registry
+        for name in ([namespace] if namespace else list(reg.commands.keys())):
+            if not pending or not (index := reg.dispatch.get(name)):
+                continue
+            candidates = dict(zip(pending, index.candidates_many([tokens[i] for i in pending])))
+            depth = 0
+            while todo := [i for i in pending if len(candidates[i]) > depth]:
+                groups: Dict[int, List[int]] = {}
+                for i in todo:
+                    groups.setdefault(candidates[i][depth], []).append(i)
+                for entry, members in groups.items():
+                    for i, res in zip(members, index.entries[entry].parse_batch([tokens[i] for i in members])):
+                        if res and res.matched:
+                            results[i] = res
+                pending = [i for i in pending if results[i] is None]
+                depth += 1
+        return [results[pos] for pos in order]
+
+    def broadcast_many(
+        self,
+        messages: Iterable[DataCollection[Union[str, Any]]],
+        namespace: Union[str, Namespace] = '',
+        workers: Optional[int] = None,
+        modules: Sequence[str] = (),
+        chunksize: int = 256,
+        mp_context: Any = None,
+    ) -> List[Optional['ArpamarRecord']]:
+        """
+        在进程池中广播一批消息, 结果以 ArpamarRecord 的形式按输入顺序返回, 未匹配的消息对应 None
+
+        命令对象本身无法被 pickle, 工作进程通过继承当前进程的命令 (fork 启动方式),
+        或在初始化时导入 modules 中定义命令的模块来获得命令; 消息按 chunksize 分批发送.
+        spawn 与 forkserver 启动方式下须指定 modules, 工作进程中命名空间没有命令时抛出 ValueError
+
+        Args:
+            messages: 待解析的消息, 可以是惰性的可迭代对象
+            namespace: 命名空间
+            workers: 工作进程数, 默认为 CPU 数
+            modules: 工作进程启动时需要导入的模块
+            chunksize: 每批消息的数量
+            mp_context: 传递给 ProcessPoolExecutor 的 multiprocessing 上下文
+        """
+        return list(self.broadcast_stream(messages, namespace, workers, modules, chunksize, mp_context))
+
+    def broadcast_stream(
+        self,
+        messages: Iterable[DataCollection[Union[str, Any]]],
+        namespace: Union[str, Namespace] = '',
+        workers: Optional[int] = None,
+        modules: Sequence[str] = (),
+        chunksize: int = 256,
+        mp_context: Any = None,
+    ) -> Iterator[Optional['ArpamarRecord']]:
+        """broadcast_many 的惰性版本, 同时在途的批次数有上限, 输入不会被一次性读入内存"""
+        if isinstance(namespace, Namespace):
+            namespace = namespace.name
+        return _pool_stream(_worker_broadcast, namespace, messages, workers, modules, chunksize, mp_context)
 
     def all_command_help(
             self,
@@ -328,3 +738,45 @@ class CommandManager(metaclass=Singleton):
 
 
 command_manager = CommandManager()
+
+
+def _worker_init(modules: Tuple[str, ...]) -> None:
+    """工作进程的初始化, 导入定义命令的模块"""
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _worker_broadcast(namespace: str, chunk: List[Any]) -> List[Optional['ArpamarRecord']]:
+    """在工作进程中广播一批消息; 工作进程没有获得命令时抛出 ValueError, 而不是把每条消息都当作未匹配"""
+    if not command_manager.get_commands(namespace):
+        raise ValueError(config.lang.manager_worker_no_commands.format(target=namespace))
+    return [None if res is None else res.record() for res in command_manager.broadcast_batch(chunk, namespace)]
+
+
+def _worker_parse(command: str, chunk: List[Any]) -> List[Optional['ArpamarRecord']]:
+    """在工作进程中以指定的命令解析一批消息"""
+    if (target := command_manager.get_command(command)) is None:
+        raise ValueError(config.lang.manager_undefined_command.format(target=command))
+    return [None if res is None else res.record() for res in target.parse_batch(chunk)]
+
+
+def _pool_stream(
+    worker: Callable[[str, List[Any]], List[Optional['ArpamarRecord']]],
+    target: str,
+    messages: Iterable[Any],
+    workers: Optional[int] = None,
+    modules: Sequence[str] = (),
+    chunksize: int = 256,
+    mp_context: Any = None,
+) -> Iterator[Optional['ArpamarRecord']]:
+    """将消息分批交由进程池中的 worker 处理, 按输入顺序产出结果; 同时在途的批次数不超过工作进程数的两倍"""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, mp_context, _worker_init, (tuple(modules),)) as executor:
+        pending: Deque[Any] = deque()
+        source = iter(messages)
+        while True:
+            while len(pending) < 2 * workers and (chunk := list(islice(source, chunksize))):
+                pending.append(executor.submit(worker, target, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
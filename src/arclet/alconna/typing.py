@@ -1,6 +1,13 @@
 """Alconna 参数相关"""
-from typing import TypeVar, Iterator, runtime_checkable, Protocol, Union, Any, Literal, Optional
-from nepattern import BasePattern
+import re
+from array import array
+from typing import TypeVar, Iterator, runtime_checkable, Protocol, Union, Any, Literal, Optional, List, Sequence
+from nepattern import BasePattern, pattern_map
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 
 DataUnit = TypeVar("DataUnit", covariant=True)
 
@@ -20,10 +27,14 @@ class MultiArg(BasePattern):
     """对可变参数的匹配"""
     flag: str
     array_length: Optional[int]
+    vectorized: bool
+    _slice: Optional["re.Pattern[str]"]
 
     def __init__(self, base: BasePattern, flag: Literal['args', 'kwargs'] = 'args', length: Optional[int] = None):
         self.flag = flag
         self.array_length = length
+        self.vectorized = False
+        self._slice = None
         if flag == 'args':
             alias = f"*({base})[:{length}]" if length else f"*({base})"
         else:
@@ -35,6 +46,42 @@ class MultiArg(BasePattern):
     def __repr__(self):
         return self.alias
 
+    @property
+    def vectorizable(self) -> bool:
+        """是否为可批量转换的 int 或 float 可变参数"""
+        return (
+            self.flag == 'args' and self.origin in (int, float) and not self.validators and not self.anti and
+            self.converter is getattr(pattern_map.get(self.origin), "converter", None)
+        )
+
+    def valid_prefix(self, raw: List[str]) -> int:
+        """
+        以一次正则匹配校验整段数字文本, 返回从头开始连续通过校验的个数
+
+        各文本以 \\0 连接后整体匹配; 文本自身含有 \\0 时退化为逐个校验
+        """
+        if not raw:
+            return 0
+        if self._slice is None:
+            self._slice = re.compile(rf"(?:(?:{self.regex_pattern.pattern.lstrip('^').rstrip('$')})\0)*")
+        if (text := "\0".join(raw)).count("\0") != len(raw) - 1:
+            return next((i for i, item in enumerate(raw) if not self.regex_pattern.match(item)), len(raw))
+        return self._slice.match(f"{text}\0").group().count("\0")  # type: ignore
+
+    def batch(self, raw: List[Any]) -> Sequence:
+        """
+        将已通过校验的数字文本一次性转换为数组
+
+        安装了 numpy 时返回 ndarray, 否则返回 array.array; 超出 64 位范围时退化为 tuple.
+        该数组即为参数的结果, 解析结果中的 __varargs__ 与传给 ArgAction 的可变参数同样是它, 而不是 list
+        """
+        try:
+            if np is not None:
+                return np.array(raw).astype(np.int64 if self.origin is int else np.float64)
+            return array('q' if self.origin is int else 'd', map(self.origin, raw))
+        except (OverflowError, ValueError):
+            return tuple(map(self.origin, raw))
+
 
 __all__ = [
     "DataCollection", "TDataCollection", "MultiArg"
@@ -1,9 +1,10 @@
 """杂物堆"""
+import re
 import contextlib
 import inspect
 from functools import lru_cache
 from collections import OrderedDict
-from typing import TypeVar, Optional, Any, Iterator, Hashable, Tuple, Union, Mapping
+from typing import TypeVar, Optional, Any, Iterator, Hashable, Tuple, Union, Mapping, List
 
 R = TypeVar('R')
 
@@ -27,25 +28,45 @@ class Singleton(type):
         mcs._instances.pop(cls, None)
 
 
+@lru_cache(256)
+def _chunk(specials: str):
+    """匹配不含任何特殊字符的最长片段"""
+    return re.compile(f"[^{re.escape(specials)}]+").match
+
+
+_escapes = re.compile(r"[\\'\"\0]").search
+
+
 @lru_cache(4096)
 def split_once(text: str, separates: Union[str, Tuple[str, ...]], crlf: bool = True):
     """单次分隔字符串"""
-    out_text = ""
-    quotation = ""
     separates = tuple(separates)
-    for index, char in enumerate(text):
+    seps = "".join(c for c in separates if len(c) == 1)
+    newline = "\n\r" if crlf else ""
+    outside, inside = _chunk(f"'\"{seps}{newline}"), _chunk(f"'\"{newline}")
+    out_text = []
+    quotation = ""
+    index, length = 0, len(text)
+    while index < length:
+        if chunk := (inside if quotation else outside)(text, index):
+            out_text.append(chunk.group())
+            if (index := chunk.end()) == length:
+                break
+        char = text[index]
         if char in {"'", '"'}:  # 遇到引号括起来的部分跳过分隔
             if not quotation:
                 quotation = char
                 if index and text[index - 1] == "\\":
-                    out_text += char
+                    out_text.append(char)
             elif char == quotation:
                 quotation = ""
                 if index and text[index - 1] == "\\":
-                    out_text += char
+                    out_text.append(char)
         if (char in separates and not quotation) or (crlf and char in {"\n", "\r"}):
             break
-        out_text += char
+        out_text.append(char)
+        index += 1
+    out_text = "".join(out_text)
     return out_text, text[len(out_text) + 1:]
 
 
@@ -62,24 +83,100 @@ def split(text: str, separates: Optional[Tuple[str, ...]] = None, crlf: bool = T
         List[str]: 切割后的字符串, 可能含有空格
     """
     separates = separates or (" ",)
-    result = ""
+    if not _escapes(text):  # 不含引号与转义时直接按分隔符取出各分段
+        result = _span_pattern(separates, crlf).findall(text)
+        if result and not text.endswith(result[-1]):
+            result.append("")
+        return result
+    seps = "".join(c for c in separates if len(c) == 1)
+    newline = "\n\r" if crlf else ""
+    outside, inside = _chunk(f"'\"\\{seps}{newline}"), _chunk(f"'\"\\{newline}")
+    result = []
     quotation = ""
-    for index, char in enumerate(text):
+    index, length = 0, len(text)
+    while index < length:
+        if chunk := (inside if quotation else outside)(text, index):
+            result.append(chunk.group())
+            if (index := chunk.end()) == length:
+                break
+        char = text[index]
         if char in {"'", '"'}:
             if not quotation:
                 quotation = char
                 if index and text[index - 1] == "\\":
-                    result += char
+                    result.append(char)
             elif char == quotation:
                 quotation = ""
                 if index and text[index - 1] == "\\":
-                    result += char
+                    result.append(char)
         elif (not quotation and char in separates) or (crlf and char in {"\n", "\r"}):
-            if result and result[-1] != "\0":
-                result += "\0"
+            if result and result[-1][-1] != "\0":
+                result.append("\0")
         elif char != "\\":
-            result += char
-    return result.split('\0') if result else []
+            result.append(char)
+        index += 1
+    return "".join(result).split('\0') if result else []
+
+
+@lru_cache(64)
+def _span_pattern(separates: Tuple[str, ...], crlf: bool):
+    chars = "".join(re.escape(c) for c in separates if len(c) == 1)
+    return re.compile(f"[^{chars}\\n\\r]+" if crlf else f"[^{chars}]+") if chars or crlf else re.compile(".+", re.S)
+
+
+@lru_cache(4096)
+def split_spans(
+    text: str, separates: Optional[Tuple[str, ...]] = None, crlf: bool = True
+) -> Tuple[str, Tuple[Tuple[int, int], ...]]:
+    """
+    切分字符串, 但只返回各分段在源字符串中的位置
+
+    不含引号与转义符时源字符串即为原字符串, 否则为处理后以 \\0 连接的字符串; 结果与 split 一致
+
+    Returns:
+        Tuple[str, Tuple[Tuple[int, int], ...]]: 源字符串与各分段的 (起点, 终点)
+    """
+    separates = separates or (" ",)
+    if _escapes(text):
+        source = "\0".join(split(text, separates, crlf))
+        spans, start = [], 0
+        if source:
+            while (end := source.find("\0", start)) >= 0:
+                spans.append((start, end))
+                start = end + 1
+            spans.append((start, len(source)))
+        return source, tuple(spans)
+    spans = [m.span() for m in _span_pattern(separates, crlf).finditer(text)]
+    if spans and spans[-1][1] < len(text):
+        spans.append((len(text), len(text)))
+    return text, tuple(spans)
+
+
+def find_separator(text: str, separates: Tuple[str, ...], start: int, end: int) -> int:
+    """
+    在 text[start:end] 中寻找第一个不在引号内的分隔符或换行符, 与 split_once 的切分点一致
+
+    Returns:
+        int: 分隔符的位置, 不存在时返回 -1
+    """
+    seps = "".join(c for c in separates if len(c) == 1)
+    outside, inside = _chunk(f"'\"{seps}\n\r"), _chunk("'\"\n\r")
+    quotation = ""
+    index = start
+    while index < end:
+        if chunk := (inside if quotation else outside)(text, index, end):
+            if (index := chunk.end()) == end:
+                break
+        char = text[index]
+        if char in {"'", '"'}:
+            if not quotation:
+                quotation = char
+            elif char == quotation:
+                quotation = ""
+        if (char in separates and not quotation) or char in {"\n", "\r"}:
+            return index
+        index += 1
+    return -1
 
 
 def levenshtein_norm(source: str, target: str) -> float:
@@ -113,10 +210,11 @@ class LruCache(Mapping[_K, _V]):
         self.__size = 0
 
     def get(self, key: _K, default: Optional[_T] = None) -> Union[_V, _T]:
-        if key in self.cache:
+        try:
             self.cache.move_to_end(key)
             return self.cache[key]
-        return default
+        except KeyError:  # 不存在, 或在其他线程中刚被淘汰
+            return default
 
     def __getitem__(self, item):
         if res := self.get(item):
@@ -1,7 +1,14 @@
 from typing import Union
-from nepattern import set_unit
+from nepattern import set_unit, BasePattern, PatternModel
 from arclet.alconna.analysis.analyser import Analyser
-from arclet.alconna import Alconna, Args
+from arclet.alconna import Alconna, Args, Option, Subcommand, Namespace, command_manager
+from arclet.alconna.arpamar import RejectedArpamar
+from arclet.alconna.config import config
+from arclet.alconna.analysis.base import compile
+from arclet.alconna.analysis.transition import TransitionAnalyser, Transition
+from arclet.alconna.analysis.parts import analyse_option, analyse_args_pattern, Failure
+from arclet.alconna.exceptions import ParamsUnmatched
+from arclet.alconna.base import TokenizedMessage
 
 
 def test_filter_out():
@@ -65,6 +72,173 @@ def test_with_set_unit():
     del Analyser.preprocessors['Segment']
 
 
+def test_shared_tokens():
+    class Text:
+        def __init__(self, text: str):
+            self.text = text
+
+    count = []
+    Analyser.preprocessors['Text'] = lambda x: count.append(x) or x.text
+    ana3 = Alconna("ana3", Args["foo", int])
+    ana3_1 = Alconna("ana3_1", Args["foo", str])
+    tokens = TokenizedMessage([Text("ana3_1 abc")])
+    assert ana3.parse(tokens).matched is False
+    assert ana3_1.parse(tokens).matched is True
+    assert len(count) == 1
+    res = command_manager.require(ana3_1).process_tokens(tokens).analyse()
+    assert res.foo == "abc"
+    assert len(count) == 1
+    del Analyser.preprocessors['Text']
+
+
+def test_codegen():
+    ana4 = Alconna(
+        "ana4", Args["foo", int]["bar", str, "x"], Option("--opt|-o", Args["n", int]), Option("-v"),
+        Subcommand("sub", [Option("--x")], args=Args["a", str])
+    )
+    generated = compile(ana4, codegen=True)
+    interpreted = compile(ana4)
+    assert generated.analyse.__func__ is not Analyser.analyse
+    assert interpreted.analyse.__func__ is Analyser.analyse
+    for msg in ("ana4 1", "ana4 1 y -o 2 -v", "ana4 -v 3", "ana4 sub a --x 5", "ana4 x", "ana4 -o x 1", "ana5 1"):
+        res1 = generated.process(msg).analyse()
+        res2 = interpreted.process(msg).analyse()
+        assert res1.matched == res2.matched
+        assert res1.error_info == res2.error_info
+        assert res1.all_matched_args == res2.all_matched_args
+        assert res1.options == res2.options
+        assert res1.subcommands == res2.subcommands
+    calls = []
+    ana4_1 = Alconna("ana4_1", Args["foo", BasePattern(r"(\d+)", PatternModel.REGEX_CONVERT, int, calls.append)])
+    generated = compile(ana4_1, codegen=True)
+    for msg in ("ana4_1 1 2", "ana4_1 1 --help", "ana4_2 1"):
+        res = generated.process(msg).analyse()
+        assert not res.matched and len(calls) == (0 if msg.startswith("ana4_2") else 1)
+        calls.clear()
+
+
+def test_transition_analyser():
+    Alconna.config(analyser_type=TransitionAnalyser)
+    ana5 = Alconna(
+        "ana5", Args["foo", int], Option("--opt|-o", Args["n", int]), Option("add bar"),
+        Subcommand("sub", [Option("--x"), Option("--x", Args["k", int], priority=1)], args=Args["a", str])
+    )
+    Alconna.config(analyser_type=Analyser)
+    analyser = command_manager.require(ana5)
+    assert isinstance(analyser, TransitionAnalyser)
+    assert analyser.transitions[None]["-o"][0] == Transition.OPTION
+    assert analyser.transitions[None]["sub"][0] == Transition.SUBCOMMAND
+    assert analyser.transitions["sub"]["--x"][0] == Transition.OPTIONS
+    res = ana5.parse("ana5 1 -o 2 add bar sub a --x 3")
+    assert res.matched is True
+    assert res.query("opt.n") == 2
+    assert res.query("add_bar.value") is Ellipsis
+    assert res.query("sub.x.k") == 3
+    assert ana5.parse("ana5 1 sub a --x").query("sub.x.value") is Ellipsis
+    assert ana5.parse("ana5 -o x 1").matched is False
+
+
+def test_failure():
+    ana6 = Alconna("ana6", Option("--foo", Args["bar", int]))
+    analyser = compile(ana6)
+    analyser.process("--baz 1")
+    res = analyse_option(analyser, ana6.options[0])
+    assert isinstance(res, Failure)
+    assert res.error_type is ParamsUnmatched
+    assert str(res.exception()) == "--baz dose not matched with --foo"
+    analyser.process("--foo x")
+    res = analyse_option(analyser, ana6.options[0])
+    assert isinstance(res, Failure)
+    assert res.error_type is ParamsUnmatched
+    assert repr(ana6.parse("ana6 --foo x").error_info) == repr(repr(res))
+    arp = Alconna("ana6_1", Args["foo", int]).parse("ana6_1 x")
+    info, _ = arp._lazy_error  # type: ignore
+    cells = [cell.cell_contents for cell in info.__closure__ or ()]
+    assert not any(isinstance(getattr(cell, "error", cell), BaseException) for cell in cells)
+    assert arp.error_info.startswith("ParamsUnmatched(")
+
+
+def test_fast_reject():
+    ana7 = Alconna("ana7", Args["foo", int])
+    res = ana7.parse("ana8 1")
+    assert res._lazy_error is not None
+    assert res.error_data == ["ana8", "1"]
+    assert res.error_info == repr(ParamsUnmatched(config.lang.header_error.format(target="ana8")))
+    assert res._lazy_error is None
+    ana7_1 = Alconna("ana7", Args["foo", int], namespace=Namespace("ana7", fast_reject=True))
+    res1 = ana7_1.parse("ana8 1")
+    assert isinstance(res1, RejectedArpamar)
+    assert res1.matched is False
+    assert res1.error_info == repr(ParamsUnmatched(config.lang.header_error.format(target="ana7")))
+    assert ana7_1.parse("ana9 2") is res1
+    assert ana7_1.parse("ana7 2").foo == 2
+
+
+def test_precompiled_patterns():
+    import re
+    from unittest.mock import patch
+
+    ana8 = Alconna(
+        "ana8", ["!", 123], Args["foo", int]["bar;K", str, "x"], Option("-f", Args["num", int], separators=""),
+        Subcommand("sub", [Option("-g", Args["n", int, 0], separators="")]),
+    )
+    ana8.parse("!ana8 1 bar=y -f2 sub -g")
+    # re.match/re.fullmatch 等以字符串为模式的调用与 re.compile 都经过 re._compile
+    with patch("re._compile", side_effect=re._compile) as mock:
+        assert ana8.parse("!ana8 2 bar=z -f3 sub -g").matched
+        assert ana8.parse([123, "ana8 3 -f4"]).matched
+        assert ana8.parse("!ana8 4 -fx").matched is False
+    assert mock.call_count == 0
+
+
+def test_tiers():
+    from arclet.alconna.analysis.tiers import analyse_header_only, analyse_main_args
+
+    ana9 = Alconna(".ana9")
+    ana9_1 = Alconna(".ana9_1", Args["text", str]["num", int, 1])
+    assert compile(ana9).analyse.__func__ is analyse_header_only
+    assert compile(ana9_1).analyse.__func__ is analyse_main_args
+    assert compile(ana9_1, tiered=False).analyse.__func__ is Analyser.analyse
+    assert compile(Alconna("ana9_2", Option("--foo"))).analyse.__func__ is Analyser.analyse
+    assert ana9.parse(".ana9").matched
+    assert not ana9.parse(".ana9 x").matched
+    assert not ana9.parse(".ana10").matched
+    assert ana9_1.parse(".ana9_1 abc").query("num") == 1
+    assert ana9_1.parse(".ana9_1 abc 2").query("num") == 2
+    assert not ana9_1.parse(".ana9_1 abc x").matched
+    assert ana9_1.parse(".ana9_1 --help").head_matched
+    calls = []
+    num = BasePattern(r"(\d+)", PatternModel.REGEX_CONVERT, int, lambda x: calls.append(x) or int(x), "num")
+    ana9_3 = Alconna(".ana9_3", Args["num", num])
+    assert compile(ana9_3).analyse.__func__ is analyse_main_args
+    assert not ana9_3.parse(".ana9_3 1 x").matched
+    assert ana9_3.parse(".ana9_3 2 --help").head_matched
+    assert calls == ["1", "2"]
+
+
+def test_args_pattern():
+    ana10 = Alconna("ana10", Args["x", int]["y", float]["unit", "cm|m|km"]["name", str], Option("--foo"))
+    analyser = compile(ana10)
+    pattern = analyser.args_patterns[id(analyser.self_args)]
+    analyser.process("ana10 1 2.5 km 'a b' --foo")
+    analyser.popitem()
+    assert analyse_args_pattern(analyser, pattern) == {"x": 1, "y": 2.5, "unit": "km", "name": "a b"}
+    assert analyser.popitem() == ("--foo", True)
+    analyser.process("ana10 1 2.5 mm abc")
+    analyser.popitem()
+    assert analyse_args_pattern(analyser, pattern) is None
+    assert analyser.current_index == 1
+    assert ana10.parse("ana10 1 2 m abc --foo").query("options.foo.value") is Ellipsis
+    analyser1 = compile(Alconna("ana10_1", Args["x;S", int]))
+    assert id(analyser1.self_args) not in analyser1.args_patterns
+    ana10_2 = Alconna("ana10_2", Args["x", "re:a|ab"]["y", "re:b"])
+    analyser2 = compile(ana10_2)
+    analyser2.process("ana10_2 ab b")
+    analyser2.popitem()
+    assert analyse_args_pattern(analyser2, analyser2.args_patterns[id(analyser2.self_args)]) == {"x": "a", "y": "b"}
+    assert ana10_2.parse("ana10_2 ab b").main_args == {"x": "a", "y": "b"}
+
+
 if __name__ == '__main__':
     import pytest
     pytest.main([__file__, "-vs"])
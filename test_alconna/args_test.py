@@ -1,6 +1,6 @@
-from typing import Union
+from typing import Union, Literal
 from nepattern import BasePattern, PatternModel, Bind
-from arclet.alconna import Args
+from arclet.alconna import Args, ArgField
 from arclet.alconna.analysis.base import analyse_args
 
 
@@ -62,6 +62,32 @@ def test_multi():
     assert analyse_args(arg8, "a b c d").get('multi') == ("a", "b", "c", "d")
     arg8_1 = Args().add_argument("kwargs", value=str, flags="W")
     assert analyse_args(arg8_1, "a=b c=d").get('kwargs') == {"a": "b", "c": "d"}
+    arg8_2 = Args["multi;S", int]["tail", int]["tail1", str]
+    res = analyse_args(arg8_2, "0 1 0 0 a")
+    assert (res['multi'], res['tail'], res['tail1']) == ((0, 1, 0), 0, "a")
+    assert len(analyse_args(arg8, " ".join(map(str, range(5000)))).get('multi')) == 5000
+
+
+def test_vectorized():
+    arg8_3 = Args["nums;SV", int]["name", str]
+    res = analyse_args(arg8_3, "1 -2 3 foo")
+    assert list(res['nums']) == [1, -2, 3] and res['name'] == "foo"
+    assert res['__varargs__'][0] is res['nums']
+    assert list(analyse_args(arg8_3, "1 2 x 3")['nums']) == [1, 2]
+    assert list(analyse_args(arg8_3, "1 2 3")['nums']) == [1, 2]
+    assert list(analyse_args(Args["nums;SV", float], "1.5 2")['nums']) == [1.5, 2.0]
+    assert Args["names;S", str].argument["names"]["value"].vectorizable is False
+
+
+def test_validator():
+    arg8_4 = Args["a", int]["b", float]["c", bool]["d", str]["e", ...]
+    assert all(unit['validator'] for unit in arg8_4.argument.values())
+    assert arg8_4.argument["a"]["validator"]("-12", None) == ("valid", -12)
+    assert arg8_4.argument["a"]["validator"]("x", 1) == ("default", 1)
+    assert arg8_4.argument["a"]["validator"]("x", None)[0] == "error"
+    assert arg8_4.argument["c"]["validator"]("FALSE", None) == ("valid", False)
+    assert analyse_args(arg8_4, "1 2. true x y") == {"a": 1, "b": 2.0, "c": True, "d": "x", "e": "y"}
+    assert Args["a;A", int].argument["a"]["validator"] is None
 
 
 def test_anti():
@@ -79,6 +105,56 @@ def test_choice():
     assert analyse_args(arg10_1, "d", raise_exception=False) != {"mapping": "d"}
 
 
+def test_choice_set():
+    names = "|".join(f"city{i}" for i in range(2000))
+    arg10_2 = Args["city", names]["emoji", Literal["Smile", "Cry"]]
+    assert arg10_2.argument["city"]["validator"]("city1999", None) == ("valid", "city1999")
+    assert arg10_2.argument["city"]["validator"]("city2000", "x") == ("default", "x")
+    assert arg10_2.argument["city"]["validator"]("city2000", None)[0] == "error"
+    assert analyse_args(arg10_2, "city42 Cry") == {"city": "city42", "emoji": "Cry"}
+    assert analyse_args(arg10_2, "city42 cry", raise_exception=False) != {"city": "city42", "emoji": "cry"}
+    arg10_3 = Args["emoji;C", Literal["Smile", "Cry"]]
+    assert analyse_args(arg10_3, "SMILE") == {"emoji": "Smile"}
+    assert "'Smile'" in repr(arg10_3.argument["emoji"]["value"])
+    assert Args["a", "int|float"].argument["a"]["validator"] is None
+
+
+def test_cache():
+    calls = []
+    city = BasePattern(
+        r"(\w+)", PatternModel.REGEX_CONVERT, str, lambda x: calls.append(x) or x.upper(), "city"
+    )
+    arg10_4 = Args["city", city, ArgField(cache_size=2)]
+    cache = arg10_4.argument["city"]["validator"]
+    for _ in range(3):
+        assert analyse_args(arg10_4, "beijing") == {"city": "BEIJING"}
+    assert calls == ["beijing"]
+    assert (cache.hits, cache.misses) == (2, 1)
+    analyse_args(arg10_4, "shanghai")
+    analyse_args(arg10_4, "tokyo")
+    assert cache.cache.size() == 2 and not cache.cache.has((str, "beijing"))
+    assert cache("+++", "x") == ("default", "x")
+    assert analyse_args(arg10_4, [["beijing"]], raise_exception=False) != {"city": ["beijing"]}
+    words = BasePattern(r"(.+)", PatternModel.REGEX_CONVERT, list, lambda x: calls.append(x) or x.split(","), "words")
+    arg10_6 = Args["words", words, ArgField(cache_size=2)]
+    res = analyse_args(arg10_6, "a,b")
+    res["words"].append("c")
+    assert analyse_args(arg10_6, "a,b") == {"words": ["a", "b"]}
+    assert (arg10_6.argument["words"]["validator"].misses, calls.count("a,b")) == (2, 2)
+
+
+def test_lazy():
+    calls = []
+    img = BasePattern(r"(\d+)", PatternModel.REGEX_CONVERT, int, lambda x: calls.append(x) or int(x), "img")
+    arg10_5 = Args["img", img, ArgField(lazy=True)]
+    res = analyse_args(arg10_5, "123")
+    assert not calls and not res["img"].resolved
+    assert res["img"] == 123 and res["img"] + 1 == 124
+    assert calls == ["123"]
+    assert analyse_args(arg10_5, "abc", raise_exception=False) != {"img": "abc"}
+    assert analyse_args(arg10_5, [123]) == {"img": 123}
+
+
 def test_union():
     arg11 = Args.bar[Union[int, float]]
     assert analyse_args(arg11, "1.2") == {"bar": 1.2}
@@ -1,4 +1,4 @@
-from arclet.alconna.base import Option, Subcommand, CommandNode, Args
+from arclet.alconna.base import Option, Subcommand, CommandNode, Args, TokenStream, TokenTable
 from arclet.alconna.analysis.base import analyse_option, analyse_subcommand
 
 
@@ -69,6 +69,33 @@ def test_from_callable():
     assert analyse_option(opt4, "foo 123 True") == ("foo", {"args": {"bar": 123, "baz": True}, "value": None})
 
 
+def test_token_stream():
+    text = "foo a;b;c bar"
+    stream = TokenStream(TokenTable((text, text, text, 123), (0, 4, 10, -1), (3, 9, 13, -1)))
+    assert stream.remaining() == 4
+    assert stream.pop() == ("foo", True)
+    assert stream.remaining() == 3
+    assert stream.remaining((";",)) == 5
+    assert stream.pop((";",)) == ("a", True)
+    assert stream.pop((";",), move=False) == ("b", True)
+    assert stream.release() == ["b;c", "bar", 123]
+    assert stream.release((";",)) == ["b", "c", "bar", 123]
+    assert stream.remaining() == len(stream.release())
+    assert stream.pop((";",)) == ("b", True)
+    stream.pushback("b")
+    stream.pushback("a")
+    assert stream.pop() == ("a", True)
+    assert stream.pop() == ("b", True)
+    assert stream.pop() == ("c", True)
+    assert stream.pop() == ("bar", True)
+    stream.pushback("ar", replace=True)
+    assert stream.pop() == ("ar", True)
+    assert stream.pop() == (123, False)
+    assert stream.pop() == ("", True)
+    assert stream.release(recover=True) == ["foo", "a", "b", "c", "ar", 123]
+    assert stream.table.sources[0] is text
+
+
 if __name__ == '__main__':
     import pytest
     pytest.main([__file__, "-vs"])
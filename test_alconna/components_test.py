@@ -20,6 +20,97 @@ def test_behavior():
     assert com.parse("comp 123").matched is False
 
 
+def test_execute_async():
+    import asyncio
+    from arclet.alconna import command_manager
+
+    seen = []
+
+    async def main_action(bar: int):
+        await asyncio.sleep(0.01)
+        return [bar * 10]
+
+    async def foo_action():
+        return 5
+
+    class Record(ArpamarBehavior):
+        async def operate(self, interface: "Arpamar"):
+            await asyncio.sleep(0.01)
+            seen.append(interface.main_args["bar"])
+
+    com_a = Alconna("comp_a", Args["bar", int], Option("foo", action=foo_action), action=main_action)
+    com_a.behaviors.append(Record())
+    res = asyncio.run(com_a.parse_async("comp_a 3 foo"))
+    assert res.main_args == {"bar": 30}
+    assert res.query("foo.value") == {"result": 5}
+    assert seen == [30]
+    assert asyncio.run(command_manager.broadcast_async("comp_a 4")).main_args == {"bar": 40}
+
+
+def test_execute_concurrent():
+    import asyncio
+    from arclet.alconna import CommandMeta
+
+    async def main():
+        started = asyncio.Event()
+        order = []
+
+        async def foo_action():
+            started.set()
+            return 1
+
+        async def bar_action():
+            await asyncio.wait_for(started.wait(), 1)  # 只有与 foo 并发执行时才能等到
+            return 2
+
+        class First(ArpamarBehavior):
+            @classmethod
+            async def operate(cls, interface: "Arpamar"):
+                order.append("first")
+
+        class Second(ArpamarBehavior):
+            requires = [First]
+
+            @classmethod
+            def operate(cls, interface: "Arpamar"):
+                order.append("second")
+
+        com_c = Alconna(
+            "comp_c", Option("bar", action=bar_action), Option("foo", action=foo_action),
+            behaviors=[Second, First], meta=CommandMeta(concurrent=True)
+        )
+        res = await com_c.parse_async("comp_c bar foo")
+        assert res.query("bar.value") == {"result": 2}
+        assert res.query("foo.value") == {"result": 1}
+        assert order == ["first", "second"]
+
+    asyncio.run(main())
+
+
+def test_execute_executor():
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from arclet.alconna import CommandMeta
+    from arclet.alconna.config import config
+
+    threads = {}
+    com_d = Alconna("comp_d", Option("foo", action=lambda: threads.setdefault("d", threading.get_ident())))
+    com_e = Alconna(
+        "comp_e", Option("foo", action=lambda: threads.setdefault("e", threading.get_ident())),
+        meta=CommandMeta(concurrent=True)
+    )
+    with ThreadPoolExecutor(1) as executor:
+        config.set_executor(executor)
+        try:
+            asyncio.run(com_d.parse_async("comp_d foo"))
+            asyncio.run(com_e.parse_async("comp_e foo"))
+        finally:
+            config.set_executor(None)
+    assert threads["d"] == threading.get_ident()
+    assert threads["e"] != threading.get_ident()
+
+
 def test_set_defualt():
     com1 = Alconna("comp1") + \
            Option("--foo", action=store_value(123)) + \
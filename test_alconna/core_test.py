@@ -350,6 +350,70 @@ def test_interrupt():
     assert ana.push("1", "a").analyse().matched
 
 
+def test_special_after_failure():
+    alc22_1 = Alconna("core22_1", Args["foo", int]["bar", int])
+    assert alc22_1.parse("core22_1 1 --help").error_info.startswith("ArgumentMissing(")
+    assert alc22_1.parse("core22_1 --help").error_info == repr("NoneType: None\n")
+
+
+def test_parse_async():
+    import asyncio
+    from nepattern import BasePattern, PatternModel
+
+    async def fetch(uid: str):
+        await asyncio.sleep(0.05)
+        if uid == "0":
+            raise ValueError(uid)
+        return {"id": int(uid)}
+
+    user = BasePattern(r"@(\d+)", PatternModel.REGEX_CONVERT, dict, fetch, "user")
+    alc22 = Alconna("core22", Args["a", user]["b", user], Option("-r", Args["r", user]))
+    res = asyncio.run(alc22.parse_async("core22 @1 @2 -r @3"))
+    assert res.matched
+    assert res.main_args == {"a": {"id": 1}, "b": {"id": 2}}
+    assert res.query("r.r") == {"id": 3}
+    assert not asyncio.run(alc22.parse_async("core22 @1 @0")).matched
+    assert not asyncio.run(alc22.parse_async("core22 1 @2")).matched
+    res = alc22.parse("core22 @4 @5")
+    assert res.matched and not res.main_args["a"].resolved
+    assert asyncio.run(res.main_args["a"].resolve()) == {"id": 4}
+
+
+def test_reentrant_parse():
+    from concurrent.futures import ThreadPoolExecutor
+
+    inner = []
+
+    def action(foo: int, bar: str):
+        if foo > 0:
+            inner.append(alc23.parse(f"core23 {foo - 1} x").main_args["foo"])
+
+    alc23 = Alconna("core23", Args["foo", int]["bar", str], Option("-b", Args["baz", float]), action=action)
+    assert alc23.parse("core23 2 y").main_args == {"foo": 2, "bar": "y"}
+    assert inner == [0, 1]
+
+    def job(i: int):
+        res = alc23.parse(f"core23 0 s{i} -b {i}.5")
+        return res.main_args == {"foo": 0, "bar": f"s{i}"} and res.query("b.baz") == i + 0.5
+
+    with ThreadPoolExecutor(4) as executor:
+        assert all(executor.map(job, range(200)))
+
+
+def test_parse_batch():
+    calls = []
+
+    alc24 = Alconna("core24", Args["foo", int], action=lambda foo: calls.append(foo))
+    res = alc24.parse_batch(["core24 1", "core24 2", "core24 1", "core24 a"])
+    assert [r.matched for r in res] == [True, True, True, False]
+    assert res[0] is res[2] and res[1].main_args == {"foo": 2}
+    assert calls == [1, 2]
+    alc24_1 = Alconna("core24_1", Args["foo", int]) | Alconna("core24_1", Args["foo", str])
+    res = alc24_1.parse_batch(["core24_1 1", "core24_1 a", "core24_1"])
+    assert [r.main_args for r in res[:2]] == [{"foo": 1}, {"foo": "a"}]
+    assert not res[2].matched
+
+
 if __name__ == "__main__":
     import pytest
 
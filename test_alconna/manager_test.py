@@ -0,0 +1,154 @@
+from arclet.alconna import Alconna, Args, Option, command_manager
+from arclet.alconna.manager import DispatchIndex
+from arclet.alconna.base import TokenizedMessage
+
+
+def test_broadcast():
+    alc1 = Alconna("bc1", Args["foo", int], namespace="Broadcast")
+    alc2 = Alconna("bc2", ["/", "!"], Option("bar"), namespace="Broadcast")
+    alc3 = Alconna("bc{num:int}", namespace="Broadcast")
+    assert command_manager.broadcast("bc1 123", "Broadcast").source == alc1
+    assert command_manager.broadcast("!bc2 bar", "Broadcast").source == alc2
+    assert command_manager.broadcast("bc3", "Broadcast").source == alc3
+    assert command_manager.broadcast("hello world", "Broadcast") is None
+    alc1.shortcut("bc_test", "bc1 321")
+    assert command_manager.broadcast("bc_test", "Broadcast").foo == 321
+
+
+def test_dispatch_index():
+    alc4 = Alconna("bc4", ["/", "!"], namespace="Dispatch")
+    alc5 = Alconna("bc5{foo}", namespace="Dispatch")
+    alc6 = Alconna("bc6", namespace="Dispatch")
+    assert DispatchIndex.literal_heads(alc4) == ["/bc4", "!bc4"]
+    assert DispatchIndex.literal_heads(alc5) is None
+    index = DispatchIndex(command_manager.get_commands("Dispatch"))
+    assert index.candidates(TokenizedMessage("/bc4")) == [0, 1]
+    assert index.candidates(TokenizedMessage("bc6 abc")) == [1, 2]
+    assert index.candidates(TokenizedMessage("abc")) == [1]
+    index.add_shortcut("bc6", "abc")
+    assert index.candidates(TokenizedMessage("abc")) == [1, 2]
+    index.remove_shortcut("bc6", "abc")
+    assert index.candidates(TokenizedMessage("abc")) == [1]
+    alc6.shortcut("bc6s", "bc6")
+    assert command_manager.registry.dispatch["Dispatch"].candidates(TokenizedMessage("bc6s")) == [1, 2]
+    assert command_manager.broadcast("bc6s", "Dispatch").source == alc6
+    command_manager.delete_shortcut("bc6s", alc6)
+    assert command_manager.registry.dispatch["Dispatch"].candidates(TokenizedMessage("bc6s")) == [1]
+
+
+def test_registry_snapshot():
+    alc7 = Alconna("bc7", Args["foo", int], namespace="Snapshot")
+    snapshot = command_manager.registry
+    with command_manager.transaction():
+        alc7.add("--bar")
+        assert command_manager.registry is snapshot
+        assert command_manager.broadcast("bc7 1", "Snapshot").matched
+    assert command_manager.registry is not snapshot
+    assert snapshot.commands["Snapshot"] == {"bc7": alc7}
+    assert command_manager.broadcast("bc7 1 --bar", "Snapshot").find("bar")
+    alc8 = Alconna("bc8", namespace="Snapshot")
+    command_manager.delete(alc8)
+    assert command_manager.get_commands("Snapshot") == [alc7]
+    assert "bc8" not in snapshot.commands["Snapshot"]
+    group = Alconna("bc9_1", Args["foo", int]) | Alconna("bc9_1", Args["foo", bool])
+    group.reset_namespace("Snapshot")
+    commands = group.commands
+    other = Alconna("bc9_1", Args["foo", str]) | Alconna("bc9_1", Args["foo", float])
+    with command_manager.transaction():
+        other.reset_namespace("Snapshot")
+        assert group.commands is commands
+    assert command_manager.registry.commands["Snapshot"][group.name] is group
+    assert group.commands == [*commands, *other.commands]
+    assert command_manager.broadcast("bc9_1 a", "Snapshot").main_args == {"foo": "a"}
+
+
+def test_broadcast_many():
+    import multiprocessing
+
+    Alconna("bc9", Args["foo", int], Option("--bar"), namespace="Pool")
+    Alconna("bc10", Args["foo", str], namespace="Pool")
+    messages = ["bc9 1", "bc10 a", "bc11", "bc9 2 --bar"] * 3
+    context = multiprocessing.get_context("fork")
+    res = command_manager.broadcast_many(messages, "Pool", 2, chunksize=2, mp_context=context)
+    assert len(res) == 12
+    assert res[0].source == "Pool::bc9" and res[0].main_args == {"foo": 1}
+    assert res[1].main_args == {"foo": "a"}
+    assert res[2] is None
+    assert res[11].options == {"bar": Ellipsis}
+    assert res[4:8] == [(arp := command_manager.broadcast(msg, "Pool")) and arp.record() for msg in messages[:4]]
+
+
+def test_broadcast_batch():
+    import multiprocessing
+    import os
+    import sys
+    import tempfile
+
+    alc11 = Alconna("bc11", Args["foo", int], namespace="Batch")
+    Alconna("bc12", ["/"], Args["foo", str], namespace="Batch")
+    alc11.shortcut("bc11s", "bc11 3")
+    messages = ["bc11 1", "/bc12 a", "bc11s", "bc11 a", "bc12", "bc11 1"]
+    res = command_manager.broadcast_batch(messages, "Batch")
+    assert [r and r.main_args for r in res] == [{"foo": 1}, {"foo": "a"}, {"foo": 3}, None, None, {"foo": 1}]
+    assert [r and r.record() for r in res] == [
+        (arp := command_manager.broadcast(msg, "Batch")) and arp.record() for msg in messages
+    ]
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "spawn_commands.py"), "w") as f:
+            f.write('from arclet.alconna import Alconna, Args\n')
+            f.write('Alconna("bc13", Args["foo", int], namespace="Spawn")\n')
+        sys.path.insert(0, tmp)
+        try:
+            messages = ["bc13 1", "bc13 a", "bc14"]
+            errors = []
+            try:
+                command_manager.broadcast_many(messages, "Spawn", 1, mp_context=context)
+            except ValueError as e:
+                errors.append(str(e))
+            assert errors and "Spawn" in errors[0]
+            res = command_manager.broadcast_many(messages, "Spawn", 1, ["spawn_commands"], mp_context=context)
+            assert res[0].source == "Spawn::bc13" and res[0].main_args == {"foo": 1}
+            assert res[1:] == [None, None]
+        finally:
+            sys.path.remove(tmp)
+
+
+def test_cli():
+    import io
+    import json
+    import os
+    import tempfile
+    from arclet.alconna.__main__ import main
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "cli_commands.py"), "w") as f:
+            f.write('from arclet.alconna import Alconna, Args, Option\n')
+            f.write('Alconna("cli1", Args["foo", int], Option("--bar"), namespace="Cli")\n')
+        with open(os.path.join(tmp, "input.ndjson"), "w") as f:
+            f.write('"cli1 1 --bar"\n{"message": "cli1 a"}\n"cli2"\n')
+        out = io.StringIO()
+        main([os.path.join(tmp, "cli_commands.py"), os.path.join(tmp, "input.ndjson"), "--ndjson", "-n", "Cli"], out)
+        res = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert res[0] == {
+            "command": "Cli::cli1", "matched": True, "main_args": {"foo": 1}, "options": {"bar": None},
+            "subcommands": {}, "error": None
+        }
+        assert res[1]["command"] is None and res[2]["command"] is None
+        out = io.StringIO()
+        main(["cli_commands", os.path.join(tmp, "input.ndjson"), "--ndjson", "-c", "Cli::cli1"], out)
+        res = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r["matched"] for r in res] == [True, False, False]
+        assert res[1]["command"] == "Cli::cli1" and res[1]["error"]
+        with open(os.path.join(tmp, "input.txt"), "wb") as f:
+            f.write(b"cli1 \xff\ncli1 2\n")
+        out = io.StringIO()
+        main(["cli_commands", os.path.join(tmp, "input.txt"), "-c", "Cli::cli1"], out)
+        res = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r["matched"] for r in res] == [False, True]
+        assert res[0]["error"] and res[1]["main_args"] == {"foo": 2}
+
+
+if __name__ == '__main__':
+    import pytest
+    pytest.main([__file__, "-vs"])
@@ -1,3 +1,5 @@
+import random
+
 from arclet.alconna.typing import DataCollection
 from arclet.alconna.util import split_once, split, LruCache
 
@@ -22,6 +24,69 @@ def test_split():
     assert split("  ") == []
 
 
+def _split_once_reference(text, separates, crlf=True):
+    """逐字符实现的单次分割, 作为对照"""
+    out_text = ""
+    quotation = ""
+    separates = tuple(separates)
+    for index, char in enumerate(text):
+        if char in {"'", '"'}:
+            if not quotation:
+                quotation = char
+                if index and text[index - 1] == "\\":
+                    out_text += char
+            elif char == quotation:
+                quotation = ""
+                if index and text[index - 1] == "\\":
+                    out_text += char
+        if (char in separates and not quotation) or (crlf and char in {"\n", "\r"}):
+            break
+        out_text += char
+    return out_text, text[len(out_text) + 1:]
+
+
+def _split_reference(text, separates=None, crlf=True):
+    """逐字符实现的分割, 作为对照"""
+    separates = separates or (" ",)
+    result = ""
+    quotation = ""
+    for index, char in enumerate(text):
+        if char in {"'", '"'}:
+            if not quotation:
+                quotation = char
+                if index and text[index - 1] == "\\":
+                    result += char
+            elif char == quotation:
+                quotation = ""
+                if index and text[index - 1] == "\\":
+                    result += char
+        elif (not quotation and char in separates) or (crlf and char in {"\n", "\r"}):
+            if result and result[-1] != "\0":
+                result += "\0"
+        elif char != "\\":
+            result += char
+    return result.split('\0') if result else []
+
+
+def test_split_equivalence():
+    """测试分割函数与逐字符实现的结果一致"""
+    cases = [
+        "", " ", "  a  ", "a b c", "a b ", "'a b' c", "\"a 'b' c\" d", "a\\ b", "\\'a b\\' c", "'unclosed a b",
+        "a\nb\r\nc", "'a\nb' c", "a\0b", "a\0\0 b", "\\\\'x' y", "a,b;c", "a,'b;c',d", "\"", "\\", "a'",
+    ]
+    alphabet = "ab ,;'\"\\\n\r\0"
+    rand = random.Random(42)
+    cases.extend("".join(rand.choice(alphabet) for _ in range(rand.randint(0, 16))) for _ in range(3000))
+    for text in cases:
+        for separates in ((" ",), (",", ";"), (" ", "'"), (" ", "\\"), ("ab",)):
+            for crlf in (True, False):
+                assert split(text, separates, crlf) == _split_reference(text, separates, crlf), (text, separates)
+                assert split_once(text, separates, crlf) == _split_once_reference(text, separates, crlf), (
+                    text, separates
+                )
+    assert split_once("a b,c", " ,") == _split_once_reference("a b,c", " ,")
+
+
 def test_lru():
     """测试 LRU缓存"""
     cache: LruCache[str, str] = LruCache(3)